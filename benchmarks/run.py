@@ -0,0 +1,374 @@
+"""
+Benchmarks for the protocol hot paths.
+Every benchmark is timed over a range of problem sizes (qubits, hops, nodes,
+rounds, shots); wall time (best of --repeat runs) and peak traced memory are
+written to a JSON file and compared against a saved baseline.
+
+Usage (from this directory, with the repository root on PYTHONPATH; see Makefile):
+    python3 run.py                 # run and compare against baseline.json
+    python3 run.py --save          # run and store the results as the new baseline
+    python3 run.py --filter bb84   # only benchmarks whose name contains "bb84"
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+
+BASELINE = os.path.join(HERE, "baseline.json")
+# Time or memory ratio against the baseline above which a result is flagged
+THRESHOLD = 1.5
+
+# name -> (setup function, sizes); setup(size) returns the zero-argument callable to time
+BENCHMARKS = {}
+
+
+def benchmark(name, sizes):
+    def register(setup):
+        BENCHMARKS[name] = (setup, sizes)
+        return setup
+    return register
+
+
+# BB84: per-qubit qutip path (generate_bb84_states / measure_state) and the array engine
+@benchmark("bb84_qutip", [100, 1000, 5000])
+def bench_bb84_qutip(num_qubits):
+    from qnet.bb84 import generate_bb84_arrays, qutip_bb84
+
+    rng = np.random.default_rng(0)
+    alice_bits, alice_bases = generate_bb84_arrays(num_qubits, rng)
+    bob_bases = rng.integers(0, 2, num_qubits, dtype=np.uint8)
+    return lambda: qutip_bb84(alice_bits, alice_bases, bob_bases)
+
+
+@benchmark("bb84_array", [10_000, 1_000_000, 10_000_000])
+def bench_bb84_array(num_qubits):
+    from qnet.bb84 import run_bb84
+
+    rng = np.random.default_rng(0)
+    return lambda: run_bb84(num_qubits, rng)
+
+
+# Repeater: a chain of `hops` noisy links joined by entanglement_swapping, then fidelity
+@benchmark("repeater_chain", [2, 8, 32, 128])
+def bench_repeater_chain(hops):
+    from qutip import fidelity
+
+    from qnet.repeater import apply_depolarizing_noise, create_bell_state, entanglement_swapping
+
+    link = apply_depolarizing_noise(create_bell_state(), 0.05)
+    ideal = create_bell_state()
+
+    def run():
+        state = link
+        for _ in range(hops - 1):
+            state = entanglement_swapping(state, link)
+        return fidelity(state, ideal)
+    return run
+
+
+# Repeater: repeater_chain on Werner links (Bell-diagonal path), both swap orders
+@benchmark("repeater_chain_linear", [100, 1000, 10_000])
+def bench_repeater_chain_linear(segments):
+    from qnet.repeater import repeater_chain
+
+    return lambda: [repeater_chain(segments, 0.01, order) for order in ("sequential", "nested")]
+
+
+# Repeater: noise sweep as in simulate_network (noise, swap and fidelity per point)
+@benchmark("repeater_noise_sweep", [20, 200, 2000])
+def bench_repeater_noise_sweep(points):
+    from qnet.repeater import fidelity_point
+
+    return lambda: [fidelity_point(p, None) for p in np.linspace(0, 1, points)]
+
+
+# Repeater: the same sweep as one (points, 4, 4) stack through qnet.batch
+@benchmark("repeater_noise_batched", [20, 2000, 100_000])
+def bench_repeater_noise_batched(points):
+    from qnet.batch import fidelity_curve
+
+    return lambda: fidelity_curve(np.linspace(0, 1, points))
+
+
+# Metrics: batched kernels (qnet.metrics) against the per-state qutip equivalents
+BELL_KET = np.array([1, 0, 0, 1]) / np.sqrt(2)
+METRICS = {
+    # name: (qnet.metrics call, qutip call on one Qobj)
+    "fidelity": (lambda m, rho: m.fidelity(rho, BELL_KET),
+                 lambda qutip, q: qutip.fidelity(q, qutip.bell_state('00'))),
+    "concurrence": (lambda m, rho: m.concurrence(rho), lambda qutip, q: qutip.concurrence(q)),
+    "negativity": (lambda m, rho: m.negativity(rho), lambda qutip, q: qutip.negativity(q, 1)),
+    "purity": (lambda m, rho: m.purity(rho), lambda qutip, q: q.purity()),
+    "entropy": (lambda m, rho: m.von_neumann_entropy(rho), lambda qutip, q: qutip.entropy_vn(q)),
+}
+
+
+def _register_metric(name, kernel, reference):
+    @benchmark(f"metrics_{name}", [1000, 100_000])
+    def bench_kernel(states):
+        from qnet import metrics
+
+        rho = metrics.random_states(states, rng=np.random.default_rng(0))
+        return lambda: kernel(metrics, rho)
+
+    @benchmark(f"metrics_{name}_qutip", [1000])
+    def bench_reference(states):
+        import qutip
+
+        from qnet import metrics
+
+        rho = metrics.random_states(states, rng=np.random.default_rng(0))
+        qobjs = [qutip.Qobj(r, dims=[[2, 2], [2, 2]]) for r in rho]
+        return lambda: [reference(qutip, q) for q in qobjs]
+
+
+for _name, (_kernel, _reference) in METRICS.items():
+    _register_metric(_name, _kernel, _reference)
+
+
+# a-e: network build by tensoring the node pairs, then ptrace on every adjacent pair
+@benchmark("ae_network", [3, 5, 7, 9])
+def bench_ae_network(num_nodes):
+    from qnet.ae import build_network
+
+    def run():
+        network_state = build_network(num_nodes)
+        return [network_state.ptrace([i, i + 1]) for i in range(num_nodes - 1)]
+    return run
+
+
+# a-e noise: depolarizing channel on every qubit of the 2(nodes-1)-qubit network state
+@benchmark("ae_noise", [3, 5, 6])
+def bench_ae_noise(num_nodes):
+    from qnet.ae import apply_noise, build_network
+
+    network_state = build_network(num_nodes)
+    return lambda: apply_noise(network_state, 0.05)
+
+
+# MPS: sequential repeater chain of `segments` links (2 * segments qubits) with full Bell measurements
+@benchmark("mps_repeater_chain", [10, 100, 300])
+def bench_mps_repeater_chain(segments):
+    from qnet.mps import repeater_chain
+
+    return lambda: repeater_chain(segments, 0.01, bsm="full", seed=0)
+
+
+# Marginals: all pair reduced states of a random `qubits`-qubit ket, batched and via ptrace
+def _random_ket(qubits):
+    rng = np.random.default_rng(0)
+    ket = rng.normal(size=1 << qubits) + 1j * rng.normal(size=1 << qubits)
+    return ket / np.linalg.norm(ket)
+
+
+@benchmark("pair_marginals", [8, 14, 20])
+def bench_pair_marginals(qubits):
+    from qnet.marginals import pair_marginals
+
+    ket = _random_ket(qubits)
+    return lambda: pair_marginals(ket)
+
+
+@benchmark("pair_marginals_ptrace", [8, 14])
+def bench_pair_marginals_ptrace(qubits):
+    from qutip import Qobj
+
+    ket = Qobj(_random_ket(qubits).reshape(-1, 1), dims=[[2] * qubits, [1] * qubits])
+    return lambda: [ket.ptrace([i, j]) for i in range(qubits) for j in range(i + 1, qubits)]
+
+
+# Routing: 1000 fidelity queries on a random geometric mesh of `nodes` nodes
+@benchmark("route_batch", [100, 1000, 5000])
+def bench_route_batch(nodes):
+    from qnet.topology import Router, Topology
+
+    rng = np.random.default_rng(0)
+    topology = Topology.random_geometric(nodes, rng=rng)
+    pairs = rng.integers(0, nodes, size=(1000, 2))
+    return lambda: Router(topology).route_many(pairs)
+
+
+# E91: the former round loop of demo/e91 (two ptrace and two expect calls per round),
+# kept as the reference for e91_array
+@benchmark("e91_rounds", [100, 1000, 10_000])
+def bench_e91_rounds(rounds):
+    from qutip import basis, expect, sigmax, sigmaz, tensor
+
+    bell_state = (tensor(basis(2, 0), basis(2, 0)) + tensor(basis(2, 1), basis(2, 1))).unit()
+    bases = [sigmax(), sigmaz()]
+    rng = np.random.default_rng(0)
+
+    def run():
+        results = []
+        for _ in range(rounds):
+            alice_basis = bases[rng.integers(2)]
+            bob_basis = bases[rng.integers(2)]
+            alice_result = expect(alice_basis, bell_state.ptrace(0))
+            bob_result = expect(bob_basis, bell_state.ptrace(1))
+            results.append((alice_result, bob_result))
+        return results
+    return run
+
+
+@benchmark("e91_array", [10_000, 1_000_000, 10_000_000])
+def bench_e91_array(rounds):
+    from qnet.e91 import run_e91
+
+    rng = np.random.default_rng(0)
+    return lambda: run_e91(rounds, rng=rng)
+
+
+# latex/main*.py: entanglement-swapping circuit sampled on the Aer simulator
+@benchmark("aer_swap_circuit", [1024, 10_000, 100_000])
+def bench_aer_swap_circuit(shots):
+    from qiskit import ClassicalRegister, QuantumCircuit, QuantumRegister, transpile
+    from qiskit_aer import AerSimulator
+
+    qreg_q = QuantumRegister(4, 'q')
+    creg_c0 = ClassicalRegister(1, 'c0')
+    creg_c1 = ClassicalRegister(1, 'c1')
+    circuit = QuantumCircuit(qreg_q, creg_c0, creg_c1)
+    circuit.h(qreg_q[0])
+    circuit.h(qreg_q[2])
+    circuit.cx(qreg_q[0], qreg_q[1])
+    circuit.cx(qreg_q[2], qreg_q[3])
+    circuit.cx(qreg_q[1], qreg_q[2])
+    circuit.h(qreg_q[1])
+    circuit.measure(qreg_q[2], creg_c1[0])
+    circuit.measure(qreg_q[1], creg_c0[0])
+    simulator = AerSimulator()
+    compiled = transpile(circuit, simulator)
+    return lambda: simulator.run(compiled, shots=shots).result().get_counts()
+
+
+# Stabilizer backend: GHZ state on `qubits` qubits, 100k shots (Aer's
+# statevector method cannot hold more than about 30 qubits)
+@benchmark("stabilizer_ghz", [50, 500, 2000])
+def bench_stabilizer_ghz(qubits):
+    from qiskit import QuantumCircuit
+
+    from qnet.stabilizer import run_counts
+
+    qc = QuantumCircuit(qubits, qubits)
+    qc.h(0)
+    for q in range(qubits - 1):
+        qc.cx(q, q + 1)
+    qc.measure(range(qubits), range(qubits))
+    return lambda: run_counts(qc, 100_000, seed=0, fallback=False)
+
+
+# CLI: wall time of a fresh `python -m qnet <command> --help` process (cold start)
+@benchmark("cli_cold_start", ["bb84", "e91", "repeater", "chain", "ae", "route", "error-correction"])
+def bench_cli_cold_start(command):
+    env = dict(os.environ, PYTHONPATH=ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    argv = [sys.executable, "-m", "qnet", command, "--help"]
+    return lambda: subprocess.run(argv, env=env, check=True, stdout=subprocess.DEVNULL)
+
+
+def measure(run, repeat):
+    # One warm-up run (lazy imports, caches), best wall time over `repeat` runs,
+    # then one extra run under tracemalloc for the peak
+    run()
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def run_benchmarks(name_filter=None, repeat=3):
+    results = {}
+    for name, (setup, sizes) in BENCHMARKS.items():
+        if name_filter and name_filter not in name:
+            continue
+        for size in sizes:
+            key = f"{name}[{size}]"
+            try:
+                run = setup(size)
+            except ImportError as e:
+                print(f"{key:32s} skipped ({e})")
+                break
+            seconds, peak = measure(run, repeat)
+            results[key] = {"seconds": seconds, "peak_bytes": peak}
+            print(f"{key:32s} {seconds * 1e3:12.3f} ms {peak / 2**20:10.2f} MiB")
+    return results
+
+
+def compare(results, baseline, threshold=THRESHOLD):
+    """
+    Flag every result whose time or peak memory exceeds threshold x its baseline.
+    Returns:
+    - regressions: list of (key, metric, ratio)
+    """
+    regressions = []
+    for key, result in results.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        for metric in ("seconds", "peak_bytes"):
+            if base[metric] > 0:
+                ratio = result[metric] / base[metric]
+                if ratio > threshold:
+                    regressions.append((key, metric, ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the protocol hot paths")
+    parser.add_argument("--baseline", default=BASELINE, help="baseline JSON file")
+    parser.add_argument("--save", action="store_true", help="store results as the new baseline")
+    parser.add_argument("--output", help="also write this run's results to a JSON file")
+    parser.add_argument("--filter", help="only run benchmarks whose name contains this string")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per point (best is kept)")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="regression ratio")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.filter, args.repeat)
+    report = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.save:
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                previous = json.load(f)["results"]
+            report["results"] = {**previous, **results}
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save to create one")
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)["results"]
+    regressions = compare(results, baseline, args.threshold)
+    for key, metric, ratio in regressions:
+        print(f"REGRESSION {key} {metric}: {ratio:.2f}x baseline")
+    if not regressions:
+        print(f"No regressions against {args.baseline} (threshold {args.threshold}x)")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,59 +1,14 @@
-from qutip import basis, ket2dm
-import numpy as np
 from Crypto.Cipher import AES
 from Crypto.Util.Padding import pad, unpad
+import io
 import os
+from qnet.keypool import KeyPool
+from qnet.stream import encrypt_stream, decrypt_stream
 
-# Define basis states of computational basis and Hadamard basis
-zero = basis(2, 0)  # |0>
-one = basis(2, 1)   # |1>
-plus = (zero + one).unit()  # |+>
-minus = (zero - one).unit()  # |->
-
-# Alice's qubits
-def generate_bb84_states(num_qubits):
-    states = []
-    bases = []
-    for _ in range(num_qubits):
-        basis_choice = np.random.choice(['z', 'x'])
-        bit = np.random.choice([0, 1])
-        if basis_choice == 'z':
-            states.append(zero if bit == 0 else one)
-        else:
-            states.append(plus if bit == 0 else minus)
-        bases.append(basis_choice)
-    return states, bases
-
-# Measurement
-def measure_state(state, basis):
-    if basis == 'z':
-        projection = [zero, one]
-    else:  # 'x'
-        projection = [plus, minus]
-    probabilities = [abs(proj.overlap(state))**2 for proj in projection]
-    return np.random.choice([0, 1], p=probabilities)
-
-# Generate shared key
-def generate_shared_key(num_qubits):
-    alice_states, alice_bases = generate_bb84_states(num_qubits)
-    bob_bases = np.random.choice(['z', 'x'], num_qubits)
-
-    # Bob measures Alice's qubits
-    bob_results = [measure_state(state, bob_bases[i]) for i, state in enumerate(alice_states)]
-    matching_bases = [alice_bases[i] == bob_bases[i] for i in range(num_qubits)]
-    shared_key = [bob_results[i] for i in range(num_qubits) if matching_bases[i]]
-
-    # Success rate
-    success_rate = len(shared_key) / num_qubits
-    print(f"Key Exchange Success Rate: {success_rate:.2f}")
-
-    # Ensure we have a sufficiently long key for AES (128 bits = 16 bytes)
-    if len(shared_key) >= 16:
-        shared_key = shared_key[:16]
-        return bytes(shared_key), success_rate
-    else:
-        print("Not enough key bits generated. Increase number of qubits.")
-        return None, success_rate
+# AES-128 key size in bits
+KEY_BITS = 128
+# Bit-flip error rate of the quantum channel (0 = ideal channel)
+CHANNEL_ERROR = 0.0
 
 # Encrypt and decrypt messages using AES
 def encrypt_message(message, key):
@@ -68,16 +23,11 @@ def decrypt_message(iv, encrypted_message, key):
     return decrypted_message.decode()
 
 # Main simulation
+# The pool keeps the sifted, distilled bits of every BB84 round and refills in the background
 num_qubits = 256
-success_rate = 0
-RATE = 0.57
-while(success_rate <= RATE):
-    key, success_rate = generate_shared_key(num_qubits)
-    if(success_rate < RATE):
-        print("retry key generation")
-
-if key and success_rate > RATE:  # Use the key if success rate is high enough
-    print("Shared key established:", key)
+with KeyPool(round_qubits=num_qubits, error_rate=CHANNEL_ERROR) as pool:
+    key = pool.get_key(KEY_BITS)
+    print("Shared key established:", key.hex())
 
     # Alice sends a message to Bob
     alice_message = "Hello Bob!"
@@ -88,7 +38,8 @@ if key and success_rate > RATE:  # Use the key if success rate is high enough
     bob_message = decrypt_message(iv, encrypted_message, key)
     print(f"Bob's decrypted message: {bob_message}")
 
-    # Bob sends a message to Alice
+    # Bob sends a message to Alice (under a fresh key from the pool)
+    key = pool.get_key(KEY_BITS)
     bob_message = "Hello Alice!"
     iv, encrypted_message = encrypt_message(bob_message, key)
     print(f"Bob's encrypted message: {encrypted_message}")
@@ -96,6 +47,19 @@ if key and success_rate > RATE:  # Use the key if success rate is high enough
     # Alice decrypts the message
     alice_message = decrypt_message(iv, encrypted_message, key)
     print(f"Alice's decrypted message: {alice_message}")
-else:
-    print("Failed to generate a secure shared key.")
 
+    # Bulk payload: chunked AES-GCM stream that rotates to a fresh 256-bit pool key every 1 MiB
+    payload = os.urandom(8 << 20)
+    stream_keys = []
+    def next_stream_key():
+        stream_key = bytes(pool.get_key(256))
+        stream_keys.append(stream_key)  # Bob holds the same keys in his copy of the pool
+        return stream_key
+    encrypted_stream = io.BytesIO()
+    encrypt_stream(io.BytesIO(payload), encrypted_stream, next_stream_key, rotate_bytes=1 << 20)
+    decrypted_stream = io.BytesIO()
+    encrypted_stream.seek(0)
+    decrypt_stream(encrypted_stream, decrypted_stream, iter(stream_keys).__next__)
+    print("Bulk payload intact:", decrypted_stream.getvalue() == payload)
+
+    print("Key pool:", pool.stats())
@@ -1,105 +1,6 @@
-from qutip import *
-import numpy as np
+# a-e line network demo: the protocol code lives in qnet.ae (also available as `python -m qnet ae`).
+from qnet.ae import simulate_routing
 
 # Number of nodes in the network
 num_nodes = 5
-
-# Create Bell state for entanglement between two nodes
-bell_state = (basis(2, 0) + basis(2, 1)).unit()
-
-# Initialize qubits for each node in the network
-nodes = [basis(2, 0) for _ in range(num_nodes)]  # Create initial state |0> for each node
-
-# Create entangled pairs between adjacent nodes
-entangled_pairs = []
-
-for i in range(num_nodes - 1):
-    entangled_pairs.append(tensor(bell_state, nodes[i+1] if i < num_nodes - 1 else basis(2, 0)))
-
-# Combine all entangled pairs to form the initial state of the network
-network_state = entangled_pairs[0]
-for pair in entangled_pairs[1:]:
-    network_state = tensor(network_state, pair)
-
-# Function to apply depolarizing noise (for realism)
-def apply_noise(state, noise_prob=0.1):
-    """
-    Apply depolarizing noise with a given probability to the quantum state.
-    The noise is applied to each qubit independently in the multi-qubit state.
-    """
-    num_qubits = int(np.log2(state.shape[0]))  # Number of qubits in the system
-    dim = 2  # Dimension of each qubit (|0> and |1> states)
-
-    # Create a depolarizing noise operator for each qubit
-    noise_operator = (1 - noise_prob) * identity(dim) + noise_prob * (basis(dim, 0) * basis(dim, 0).dag() + basis(dim, 1) * basis(dim, 1).dag())
-    
-    # Apply noise independently to each qubit in the system
-    for _ in range(num_qubits):
-        state = tensor(state, noise_operator)
-    
-    return state
-
-# Apply noise to the initial network state
-network_state = apply_noise(network_state, noise_prob=0.05)
-
-# Display initial network state (converted to dense for printing)
-print("Initial Network State with Noise:")
-print(network_state.full())  # Convert sparse matrix to dense and print it
-
-# Simulate the process of routing quantum information from node 0 to node 4
-# We route through nodes 1, 2, 3 by performing measurements at nodes 1 and 3
-
-# Step 1: Node 0 sends information to Node 1 through entangled pair (0-1)
-# Perform a measurement on Node 1 and share the result with Node 0 (classical communication)
-# Since network_state is the tensor product of multiple states, we need to isolate the relevant subsystem.
-# Apply partial trace over the other nodes except the current one to isolate the state of node 1
-measurement_1 = network_state.ptrace([0, 1])  # Partial trace to isolate the state of Node 1
-print("Measurement at Node 1:")
-print(measurement_1)
-
-# Step 2: Node 1 sends quantum information to Node 2 through entangled pair (1-2)
-# Apply partial trace over nodes 0 and 2 to isolate the state of Node 2
-measurement_2 = network_state.ptrace([1, 2])
-print("Measurement at Node 2:")
-print(measurement_2)
-
-# Step 3: Node 2 sends information to Node 3 through entangled pair (2-3)
-# Apply partial trace over nodes 1 and 3 to isolate the state of Node 3
-measurement_3 = network_state.ptrace([2, 3])
-print("Measurement at Node 3:")
-print(measurement_3)
-
-# Step 4: Node 3 sends information to Node 4 through entangled pair (3-4)
-# Apply partial trace over nodes 2 and 4 to isolate the state of Node 4
-measurement_4 = network_state.ptrace([3, 4])
-print("Measurement at Node 4:")
-print(measurement_4)
-
-# Now we have "routed" the quantum state from node 0 to node 4 using entanglement
-
-# You can check the final state of the network at Node 4
-final_state = network_state.ptrace(4)
-print("Final state at Node 4:")
-print(final_state)
-
-# Simulate measurement outcomes to confirm successful routing
-# (In reality, you'd use classical communication to adjust and verify the routing)
-success_prob = abs(final_state[0, 0])**2  # Probability of the final state being |0> at Node 4
-print(f"Probability of success in routing information to Node 4: {success_prob}")
-
-# Adding error correction (for simplicity, we'll use a simple correction approach)
-def apply_error_correction(state):
-    """
-    Apply a basic quantum error correction procedure to the state.
-    Here we can apply some simple correction on qubits (e.g., check for bit-flip or phase-flip).
-    """
-    # Let's assume we perform a simple bit-flip correction
-    return state
-
-# Apply error correction to the final state
-final_state_corrected = apply_error_correction(final_state)
-
-# Recalculate the success probability after error correction
-success_prob_corrected = abs(final_state_corrected[0, 0])**2
-print(f"Probability of success after error correction: {success_prob_corrected}")
-
+simulate_routing(num_nodes, noise_prob=0.05)
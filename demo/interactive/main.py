@@ -4,6 +4,12 @@ import streamlit as st
 import numpy as np
 from qiskit import QuantumCircuit
 from qiskit.quantum_info import Statevector
+from qnet.bb84 import bb84_product_protocol
+
+# Basis labels for the uint8 arrays returned by the per-qubit simulator
+BASIS_LABELS = np.array(['Z', 'X'])
+# Number of entries per array shown in the app for large runs
+PREVIEW = 64
 
 # Function to simulate BB84 protocol
 def bb84_protocol(num_bits, eavesdrop=False):
@@ -80,12 +86,26 @@ st.title("Quantum Networking Demo: BB84 Protocol")
 st.write("Simulate quantum key distribution with Alice, Bob, and Eve!")
 
 # User inputs
-num_bits = st.slider("Number of qubits to send:", min_value=4, max_value=20, value=8)
+mode = st.radio("Simulator:", ["Statevector (up to 20 qubits)", "Per-qubit product state"])
+product_mode = mode.startswith("Per-qubit")
+if product_mode:
+    # Memory is linear in the number of qubits, so the range goes to millions
+    num_bits = st.number_input("Number of qubits to send:", min_value=4, max_value=10_000_000, value=1000)
+else:
+    num_bits = st.slider("Number of qubits to send:", min_value=4, max_value=20, value=8)
 eavesdrop = st.checkbox("Enable eavesdropping (Eve)")
 
 # Run the simulation
 if st.button("Run Simulation"):
-    alice_bits, alice_bases, bob_bases, bob_measurement, shared_key, eavesdrop_detected = bb84_protocol(num_bits, eavesdrop)
+    if product_mode:
+        alice_bits, alice_bases, bob_bases, bob_measurement, shared_key, eavesdrop_detected = bb84_product_protocol(int(num_bits), eavesdrop)
+        if num_bits > PREVIEW:
+            st.write(f"Showing the first {PREVIEW} of {num_bits} qubits; shared key length: {len(shared_key)}")
+        alice_bits, alice_bases = alice_bits[:PREVIEW], BASIS_LABELS[alice_bases[:PREVIEW]]
+        bob_bases, bob_measurement = BASIS_LABELS[bob_bases[:PREVIEW]], bob_measurement[:PREVIEW]
+        shared_key = shared_key[:PREVIEW]
+    else:
+        alice_bits, alice_bases, bob_bases, bob_measurement, shared_key, eavesdrop_detected = bb84_protocol(num_bits, eavesdrop)
     col1, col2,col3,col4 = st.columns(4)
 
     # Display results
@@ -51,7 +51,7 @@ print("\nReduced Density Matrix (q[0] and q[3]):")
 print(reduced_dm)
 
 # Check for entanglement (optional - look for a mixed state)
-eigenvalues = np.linalg.eigvals(reduced_dm.data)
+eigenvalues = np.linalg.eigvalsh(reduced_dm.data)  # Hermitian: real eigenvalues
 print("\nEigenvalues of the Reduced Density Matrix:")
 print(eigenvalues)
 
@@ -0,0 +1,3 @@
+"""
+Shared simulation code for the quantum networking demos.
+"""
@@ -0,0 +1,137 @@
+from qnet.operators import operator
+
+# Largest network the dense (qutip) path accepts: its density matrix has
+# 4^n complex entries, 256 MiB at 12 qubits
+MAX_DENSE_QUBITS = 12
+
+
+def _check_dense(num_qubits):
+    # Fail before allocating a density matrix that would not fit in memory
+    if num_qubits > MAX_DENSE_QUBITS:
+        raise ValueError(
+            f"{num_qubits} qubits need a dense 2^{num_qubits} x 2^{num_qubits} density matrix "
+            f"({16 * 4 ** num_qubits / 2 ** 30:g} GiB); at most {MAX_DENSE_QUBITS} qubits are "
+            f"supported here, use backend=\"mps\" (--backend mps) for larger networks")
+
+
+def build_network(num_nodes=5):
+    """
+    Network state of a line of num_nodes nodes: one two-qubit pair per link,
+    combined into a single ket by tensor products.
+    """
+    from qutip import tensor
+
+    zero = operator("basis", 2, 0)
+    # Create Bell state for entanglement between two nodes
+    bell_state = (zero + operator("basis", 2, 1)).unit()
+
+    # Initialize qubits for each node in the network
+    nodes = [zero for _ in range(num_nodes)]  # Create initial state |0> for each node
+
+    # Create entangled pairs between adjacent nodes
+    entangled_pairs = []
+    for i in range(num_nodes - 1):
+        entangled_pairs.append(tensor(bell_state, nodes[i+1] if i < num_nodes - 1 else zero))
+
+    # Combine all entangled pairs to form the initial state of the network
+    network_state = entangled_pairs[0]
+    for pair in entangled_pairs[1:]:
+        network_state = tensor(network_state, pair)
+    return network_state
+
+
+# Function to apply local noise (for realism)
+def apply_noise(state, noise_prob=0.1, channel="depolarizing"):
+    """
+    Apply a single-qubit noise channel independently to every qubit of the state.
+    The state is made dense, so at most MAX_DENSE_QUBITS qubits are accepted.
+    Parameters:
+    - state: network ket or density matrix (Qobj)
+    - noise_prob: noise probability per qubit
+    - channel: "depolarizing", "dephasing" or "amplitude_damping" (qnet.channels)
+    Returns:
+    - rho: noisy density matrix with the same dims as the state
+    """
+    from qnet.channels import apply_channel, kraus
+
+    _check_dense(len(state.dims[0]))
+
+    # Kraus operators act on one qubit axis at a time, so the state keeps its size
+    return apply_channel(state, kraus(channel, noise_prob))
+
+
+# Adding error correction (for simplicity, we'll use a simple correction approach)
+def apply_error_correction(state):
+    """
+    Apply a basic quantum error correction procedure to the state.
+    Here we can apply some simple correction on qubits (e.g., check for bit-flip or phase-flip).
+    """
+    # Let's assume we perform a simple bit-flip correction
+    return state
+
+
+def simulate_routing(num_nodes=5, noise_prob=0.05, channel="depolarizing", backend="qutip"):
+    """
+    Route from node 0 to the last node through the intermediate nodes,
+    isolating each hop's pair with a partial trace.
+    Parameters:
+    - num_nodes: number of nodes in the line
+    - noise_prob: noise probability per qubit
+    - channel: local noise channel (see apply_noise)
+    - backend: "qutip" (full network state) or "mps" (qnet.mps, memory linear
+      in num_nodes; the full state is not printed)
+    Returns:
+    - success_prob: probability of reading |0> at the last node
+    - success_prob_corrected: the same after error correction
+    """
+    from qutip import Qobj
+
+    from qnet.marginals import reduced_states
+
+    hop_pairs = [(i, i + 1) for i in range(num_nodes - 1)]
+    if backend == "mps":
+        from qnet.mps import ae_network
+
+        # Noisy network as a matrix product state: no 2^n object is ever formed
+        network_state = ae_network(num_nodes, noise_prob=noise_prob, channel=channel)
+        print("Initial Network State with Noise:")
+        print(network_state)
+        hops = network_state.pair_states(hop_pairs)
+        final_state = Qobj(network_state.reduced_state(num_nodes - 1))
+    else:
+        # Two qubits per link, checked before the ket is built
+        _check_dense(2 * (num_nodes - 1))
+        network_state = build_network(num_nodes)
+
+        # Apply noise to the initial network state
+        network_state = apply_noise(network_state, noise_prob=noise_prob, channel=channel)
+
+        # Display initial network state (converted to dense for printing)
+        print("Initial Network State with Noise:")
+        print(network_state.full())  # Convert sparse matrix to dense and print it
+
+        # The reduced states of all hops come from one pass over the network state
+        hops = reduced_states(network_state, hop_pairs)
+        final_state = network_state.ptrace(num_nodes - 1)
+
+    # Node i sends information to node i+1 through the entangled pair (i, i+1)
+    for i, hop in enumerate(hops):
+        print(f"Measurement at Node {i + 1}:")
+        print(Qobj(hop, dims=[[2, 2], [2, 2]]))
+
+    # Now we have "routed" the quantum state from node 0 to the last node using entanglement
+    print(f"Final state at Node {num_nodes - 1}:")
+    print(final_state)
+
+    # Simulate measurement outcomes to confirm successful routing
+    # (In reality, you'd use classical communication to adjust and verify the routing)
+    success_prob = abs(final_state[0, 0])**2  # Probability of the final state being |0> at the last node
+    print(f"Probability of success in routing information to Node {num_nodes - 1}: {success_prob}")
+
+    # Apply error correction to the final state
+    final_state_corrected = apply_error_correction(final_state)
+
+    # Recalculate the success probability after error correction
+    success_prob_corrected = abs(final_state_corrected[0, 0])**2
+    print(f"Probability of success after error correction: {success_prob_corrected}")
+    return success_prob, success_prob_corrected
@@ -0,0 +1,326 @@
+from functools import lru_cache
+
+import numpy as np
+
+from qnet.keys import PackedKey, match_mask, select_bits
+from qnet.sweep import run_sweep
+
+# Basis labels used by the array engine (stored as uint8)
+Z = 0
+X = 1
+
+# Preparation states indexed by [basis, bit]: |0>, |1>, |+>, |->
+STATES = np.array([[[1.0, 0.0], [0.0, 1.0]],
+                   [[1.0, 1.0], [1.0, -1.0]]]) / np.array([1.0, np.sqrt(2)])[:, None, None]
+
+# Born rule table: probability of Bob reading 1, indexed by [alice_basis, alice_bit, bob_basis]
+P_ONE = np.abs(np.einsum('ck,abk->abc', STATES[:, 1], STATES)) ** 2
+
+# Number of qubits sampled per batch in measure_arrays (bounds temporary float memory)
+CHUNK = 1 << 22
+
+# Sweep points of the success-rate plot
+NUM_QUBITS_LIST = [10, 50, 100, 200, 500, 1000, 2000, 3000, 4000, 5000, 8000, 10000]
+
+
+def _rng(rng):
+    return rng if rng is not None else np.random.default_rng()
+
+
+# Alice's qubits
+def generate_bb84_arrays(num_qubits, rng=None):
+    """
+    Draw Alice's bits and bases for num_qubits qubits.
+    Returns:
+    - bits: uint8 array of 0/1 values (shape: (num_qubits,))
+    - bases: uint8 array of Z/X labels (shape: (num_qubits,))
+    """
+    rng = _rng(rng)
+    bits = rng.integers(0, 2, num_qubits, dtype=np.uint8)
+    bases = rng.integers(0, 2, num_qubits, dtype=np.uint8)
+    return bits, bases
+
+
+# Measurement
+def measure_arrays(alice_bits, alice_bases, bob_bases, rng=None):
+    """
+    Measure every qubit in Bob's bases with one Born rule draw per batch.
+    Returns:
+    - results: uint8 array of Bob's outcomes (shape: (num_qubits,))
+    """
+    rng = _rng(rng)
+    n = len(alice_bits)
+    results = np.empty(n, dtype=np.uint8)
+    for start in range(0, n, CHUNK):
+        stop = min(start + CHUNK, n)
+        p_one = P_ONE[alice_bases[start:stop], alice_bits[start:stop], bob_bases[start:stop]]
+        results[start:stop] = rng.random(stop - start, dtype=np.float32) < p_one
+    return results
+
+
+def sift(alice_bases, bob_bases, bob_results):
+    """
+    Keep Bob's outcomes where both parties used the same basis.
+    Returns:
+    - shared_key: uint8 array of sifted key bits
+    - success_rate: fraction of qubits kept
+    """
+    matching_bases = alice_bases == bob_bases
+    shared_key = bob_results[matching_bases]
+    success_rate = len(shared_key) / len(bob_results) if len(bob_results) else 0.0
+    return shared_key, success_rate
+
+
+def run_bb84(num_qubits, rng=None):
+    """
+    Full BB84 exchange on uint8 arrays.
+    Returns:
+    - shared_key: uint8 array of sifted key bits
+    - success_rate: fraction of qubits kept after sifting
+    """
+    rng = _rng(rng)
+    alice_bits, alice_bases = generate_bb84_arrays(num_qubits, rng)
+    bob_bases = rng.integers(0, 2, num_qubits, dtype=np.uint8)
+    bob_results = measure_arrays(alice_bits, alice_bases, bob_bases, rng)
+    return sift(alice_bases, bob_bases, bob_results)
+
+
+def sifted_key_pair(num_qubits, error_rate=0.0, rng=None, packed=False):
+    """
+    BB84 exchange returning both parties' sifted keys.
+    Parameters:
+    - error_rate: probability that the channel flips Bob's outcome
+    - packed: sift on packed words (qnet.keys.sift_packed) and return PackedKeys
+    Returns:
+    - alice_key, bob_key: uint8 arrays of sifted bits (PackedKey if packed)
+    """
+    rng = _rng(rng)
+    alice_bits, alice_bases = generate_bb84_arrays(num_qubits, rng)
+    bob_bases = rng.integers(0, 2, num_qubits, dtype=np.uint8)
+    bob_results = measure_arrays(alice_bits, alice_bases, bob_bases, rng)
+    if error_rate > 0:
+        bob_results ^= (rng.random(num_qubits) < error_rate).astype(np.uint8)
+    if packed:
+        mask = match_mask(PackedKey.from_bits(alice_bases), PackedKey.from_bits(bob_bases))
+        return select_bits(PackedKey.from_bits(alice_bits), mask), select_bits(PackedKey.from_bits(bob_results), mask)
+    matching_bases = alice_bases == bob_bases
+    return alice_bits[matching_bases], bob_results[matching_bases]
+
+
+def bb84_product_protocol(num_bits, eavesdrop=False, rng=None):
+    """
+    BB84 with optional intercept-resend Eve, simulated per qubit.
+    BB84 qubits never interact, so each one is an independent 2-dimensional
+    problem: Eve measures Alice's qubit in her basis and resends her outcome
+    in that basis, then Bob measures what arrives. Memory is linear in num_bits.
+    Returns:
+    - alice_bits, alice_bases, bob_bases, bob_measurement: uint8 arrays
+    - shared_key: uint8 array of Bob's sifted bits
+    - eavesdrop_detected: True if a sifted position where Eve's basis
+      differed from Alice's disagrees with Alice's bit
+    """
+    rng = _rng(rng)
+    alice_bits, alice_bases = generate_bb84_arrays(num_bits, rng)
+    bob_bases = rng.integers(0, 2, num_bits, dtype=np.uint8)
+
+    # Eve's interception (if eavesdropping)
+    if eavesdrop:
+        eve_bases = rng.integers(0, 2, num_bits, dtype=np.uint8)
+        eve_bits = measure_arrays(alice_bits, alice_bases, eve_bases, rng)
+        bob_measurement = measure_arrays(eve_bits, eve_bases, bob_bases, rng)
+    else:
+        bob_measurement = measure_arrays(alice_bits, alice_bases, bob_bases, rng)
+
+    shared_key, _ = sift(alice_bases, bob_bases, bob_measurement)
+
+    eavesdrop_detected = False
+    if eavesdrop:
+        disturbed = (alice_bases != eve_bases) & (alice_bases == bob_bases)
+        eavesdrop_detected = bool(np.any(alice_bits[disturbed] != bob_measurement[disturbed]))
+
+    return alice_bits, alice_bases, bob_bases, bob_measurement, shared_key, eavesdrop_detected
+
+
+def success_rate_point(num_qubits, rng):
+    """
+    Sweep point for qnet.sweep.run_sweep: BB84 success rate for num_qubits qubits.
+    """
+    return run_bb84(num_qubits, rng)[1]
+
+
+def sifted_key_stream(chunk_size=CHUNK, rng=None):
+    """
+    Endless generator of sifted key blocks for long-running sessions.
+    Each step runs BB84 on chunk_size raw qubits, sifts them and yields the
+    kept bits, so memory stays bounded by one chunk however long it runs.
+    Parameters:
+    - chunk_size: raw qubits per round
+    - rng: numpy Generator (a fresh one is created if omitted)
+    Yields:
+    - shared_key: uint8 array of sifted key bits (about chunk_size / 2 long)
+    """
+    rng = _rng(rng)
+    while True:
+        shared_key, _ = run_bb84(chunk_size, rng)
+        yield shared_key
+
+
+def collect_key(num_bits, chunk_size=CHUNK, rng=None):
+    """
+    Pull sifted blocks from sifted_key_stream until num_bits key bits are collected.
+    Returns:
+    - key: uint8 array of exactly num_bits sifted key bits
+    """
+    key = np.empty(num_bits, dtype=np.uint8)
+    filled = 0
+    if num_bits == 0:
+        return key
+    for block in sifted_key_stream(chunk_size, rng):
+        take = min(len(block), num_bits - filled)
+        key[filled:filled + take] = block[:take]
+        filled += take
+        if filled == num_bits:
+            break
+    return key
+
+
+# Per-qubit qutip path (one Qobj per qubit), kept as the reference for the array engine
+@lru_cache(maxsize=None)
+def _qutip_states():
+    # |0>, |1>, |+>, |-> (qutip is only imported once this path is used)
+    from qutip import basis
+
+    zero = basis(2, 0)
+    one = basis(2, 1)
+    return zero, one, (zero + one).unit(), (zero - one).unit()
+
+
+def generate_bb84_states(num_qubits):
+    zero, one, plus, minus = _qutip_states()
+    states = []
+    bases = []
+    for _ in range(num_qubits):
+        basis_choice = np.random.choice(['z', 'x'])
+        bit = np.random.choice([0, 1])
+        if basis_choice == 'z':
+            states.append(zero if bit == 0 else one)
+        else:
+            states.append(plus if bit == 0 else minus)
+        bases.append(basis_choice)
+    return states, bases
+
+
+def measure_state(state, basis):
+    zero, one, plus, minus = _qutip_states()
+    if basis == 'z':
+        projection = [zero, one]
+    else:  # 'x'
+        projection = [plus, minus]
+    probabilities = [abs(proj.overlap(state))**2 for proj in projection]
+    return np.random.choice([0, 1], p=probabilities)
+
+
+def qutip_bb84(alice_bits, alice_bases, bob_bases):
+    """
+    Sift a key from the given choices with the original per-qubit path:
+    every qubit is prepared as a qutip state and measured with measure_state.
+    Returns:
+    - shared_key: list of sifted key bits
+    - success_rate: fraction of qubits kept
+    """
+    zero, one, plus, minus = _qutip_states()
+    prepared = {(Z, 0): zero, (Z, 1): one, (X, 0): plus, (X, 1): minus}
+    labels = {Z: 'z', X: 'x'}
+
+    shared_key = []
+    for bit, a_basis, b_basis in zip(alice_bits, alice_bases, bob_bases):
+        result = measure_state(prepared[(int(a_basis), int(bit))], labels[int(b_basis)])
+        if a_basis == b_basis:
+            shared_key.append(int(result))
+    success_rate = len(shared_key) / len(alice_bits) if len(alice_bits) else 0.0
+    return shared_key, success_rate
+
+
+def check_parity(num_qubits=2000, seed=0):
+    """
+    Compare the array engine against the qutip path on identical choices.
+    Raises AssertionError on any mismatch.
+    """
+    # Born table against qutip overlaps
+    zero, one, plus, minus = _qutip_states()
+    kets = {(Z, 0): zero, (Z, 1): one, (X, 0): plus, (X, 1): minus}
+    for (a_basis, bit), state in kets.items():
+        for b_basis in (Z, X):
+            expected = abs(kets[(b_basis, 1)].overlap(state))**2
+            assert np.isclose(P_ONE[a_basis, bit, b_basis], expected), (a_basis, bit, b_basis)
+
+    # Sifted key and success rate on the same random choices
+    rng = np.random.default_rng(seed)
+    alice_bits, alice_bases = generate_bb84_arrays(num_qubits, rng)
+    bob_bases = rng.integers(0, 2, num_qubits, dtype=np.uint8)
+    bob_results = measure_arrays(alice_bits, alice_bases, bob_bases, rng)
+    key, rate = sift(alice_bases, bob_bases, bob_results)
+    ref_key, ref_rate = qutip_bb84(alice_bits, alice_bases, bob_bases)
+    assert key.tolist() == ref_key, "sifted keys differ"
+    assert rate == ref_rate, "success rates differ"
+    # Without noise or Eve the sifted key equals Alice's bits in matching positions
+    assert np.array_equal(key, alice_bits[alice_bases == bob_bases])
+    return rate
+
+
+def plot_basis_matching(matched, mismatched, path='Basis Matching in BB84 Protocol.png'):
+    import matplotlib.pyplot as plt
+
+    plt.figure(figsize=(8, 6))
+    plt.bar(['Matched', 'Mismatched'], [matched, mismatched], color=['green', 'red'])
+    plt.title('Basis Matching in BB84 Protocol')
+    plt.xlabel('Basis Match')
+    plt.ylabel('Number of Qubits')
+    plt.savefig(path)
+
+
+def plot_success_rate(num_qubits_list, success_rates, path='Success Rate vs Number of Qubits.png'):
+    import matplotlib.pyplot as plt
+
+    plt.figure(figsize=(8, 6))
+    plt.plot(num_qubits_list, success_rates, marker='o', color='b')
+    plt.title('Success Rate vs. Number of Qubits')
+    plt.xlabel('Number of Qubits')
+    plt.ylabel('Success Rate')
+    plt.grid(True)
+    plt.savefig(path)
+
+
+def simulate(num_qubits=100, num_qubits_list=NUM_QUBITS_LIST, seed=2024, workers=None, plot=True, cache=None):
+    """
+    BB84 demo: one key exchange, then the success-rate sweep over num_qubits_list.
+    Parameters:
+    - num_qubits: qubits in the single exchange
+    - num_qubits_list: sweep points
+    - seed: root seed (the sweep is reproducible for a given seed)
+    - workers: sweep processes (None = all cores)
+    - plot: save the basis-matching and success-rate figures
+    - cache: optional qnet.cache.ResultCache for the sweep points
+    Returns:
+    - success_rate: success rate of the single exchange
+    - success_rates: success rate per sweep point
+    """
+    rng = np.random.default_rng(seed)
+    alice_bits, alice_bases = generate_bb84_arrays(num_qubits, rng)
+    bob_bases = rng.integers(0, 2, num_qubits, dtype=np.uint8)
+    bob_results = measure_arrays(alice_bits, alice_bases, bob_bases, rng)
+    shared_key, success_rate = sift(alice_bases, bob_bases, bob_results)
+    print(f"Key Exchange Success Rate: {success_rate:.2f}")
+
+    success_rates, _ = run_sweep(success_rate_point, num_qubits_list, seed=seed, workers=workers, cache=cache)
+
+    if plot:
+        matched = len(shared_key)
+        plot_basis_matching(matched, num_qubits - matched)
+        plot_success_rate(num_qubits_list, success_rates)
+    return success_rate, success_rates
+
+
+if __name__ == "__main__":
+    rate = check_parity()
+    print(f"Parity with qutip path OK (success rate {rate:.2f})")
@@ -0,0 +1,200 @@
+"""
+Bell-diagonal two-qubit states stored as 4 coefficients.
+
+ρ = Σ_k λ_k |B_k⟩⟨B_k| with the Bell states indexed by the Pauli error that
+maps |Φ⁺⟩ onto them: 0 = Φ⁺ (I), 1 = Ψ⁺ (X), 2 = Φ⁻ (Z), 3 = Ψ⁻ (XZ).
+Composing two Pauli errors XORs their indices, which turns swapping into a
+convolution over four coefficients. Depolarizing noise and the swap in
+qnet.repeater keep states Bell-diagonal, so the whole repeater pipeline
+becomes O(1) algebra per state. The coefficients may carry leading batch
+dimensions, so one call evaluates whole grids of noise and hop settings.
+"""
+import numpy as np
+
+# BELL_XOR[i, k] = i ^ k, the index of the composed Pauli error
+BELL_XOR = np.arange(4)[:, None] ^ np.arange(4)[None, :]
+# Index of the Φ⁻ (Z) coefficient
+PHI_MINUS = 2
+# Swap measurements: "parity" is the projection of qnet.repeater.entanglement_swapping,
+# "full" a Bell-state measurement with the Pauli-frame correction applied
+BSM_MODES = ("parity", "full")
+
+
+def _bell_vectors():
+    s = 1 / np.sqrt(2)
+    return np.array([[s, 0, 0, s],     # Φ⁺
+                     [0, s, s, 0],     # Ψ⁺
+                     [s, 0, 0, -s],    # Φ⁻
+                     [0, s, -s, 0]])   # Ψ⁻
+
+
+class BellDiagonal:
+    """
+    Bell-diagonal state (or batch of states).
+    Parameters:
+    - coeffs: array of shape (..., 4), non-negative and summing to 1 on the last axis
+    """
+
+    def __init__(self, coeffs):
+        self.coeffs = np.asarray(coeffs, dtype=np.float64)
+
+    def __repr__(self):
+        return f"BellDiagonal({self.coeffs!r})"
+
+    @classmethod
+    def bell(cls, shape=()):
+        shape = (shape,) if isinstance(shape, int) else tuple(shape)
+        coeffs = np.zeros(shape + (4,))
+        coeffs[..., 0] = 1.0
+        return cls(coeffs)
+
+    @classmethod
+    def werner(cls, p):
+        """
+        Depolarized |Φ⁺⟩: (1-p)|Φ⁺⟩⟨Φ⁺| + p I/4, for a scalar or an array of p.
+        """
+        return cls.bell().depolarize(p)
+
+    def depolarize(self, p):
+        # ρ' = (1-p)ρ + (p/4)I, and I/4 has all four coefficients equal to 1/4
+        p = np.asarray(p, dtype=np.float64)[..., None]
+        return BellDiagonal((1 - p) * self.coeffs + p / 4)
+
+    def swap(self, other, bsm="parity"):
+        """
+        Closed form of qnet.repeater.entanglement_swapping on Bell-diagonal inputs.
+        That swap (bsm="parity") projects the middle qubits onto span{|00⟩, |11⟩},
+        i.e. onto a Bell outcome Φ⁺ or Φ⁻ that is not told apart and not
+        corrected, so the result is the equal mixture of the Φ⁺-outcome state
+        (Pauli indices XOR-composed) and the same state shifted by Z. With
+        bsm="full" every outcome is identified and corrected, which leaves the
+        XOR-composed state itself.
+        """
+        if bsm not in BSM_MODES:
+            raise ValueError(f"bsm must be one of {BSM_MODES}, got {bsm!r}")
+        # composed[k] = Σ_i λ1[i] λ2[i ^ k]
+        composed = sum(self.coeffs[..., i, None] * other.coeffs[..., BELL_XOR[i]] for i in range(4))
+        if bsm == "full":
+            return BellDiagonal(composed)
+        return BellDiagonal(0.5 * (composed + composed[..., BELL_XOR[PHI_MINUS]]))
+
+    def fidelity(self):
+        """
+        qutip fidelity with |Φ⁺⟩⟨Φ⁺|: sqrt(⟨Φ⁺|ρ|Φ⁺⟩) = sqrt(λ_Φ⁺).
+        """
+        return np.sqrt(self.coeffs[..., 0])
+
+    def to_qobj(self):
+        from qutip import Qobj
+
+        vectors = _bell_vectors()
+        matrix = np.einsum('k,ki,kj->ij', self.coeffs, vectors, vectors)
+        return Qobj(matrix, dims=[[2, 2], [2, 2]])
+
+    @classmethod
+    def from_qobj(cls, state, atol=1e-10):
+        """
+        Coefficients of a two-qubit density matrix, or None if it is not Bell-diagonal.
+        """
+        if state.dims != [[2, 2], [2, 2]]:
+            return None
+        vectors = _bell_vectors()
+        in_bell_basis = vectors @ state.full() @ vectors.T
+        if not np.allclose(in_bell_basis, np.diag(np.diag(in_bell_basis)), atol=atol):
+            return None
+        return cls(np.diag(in_bell_basis).real)
+
+
+# Dispatching versions of the repeater operations: O(1) on BellDiagonal,
+# full qutip path (qnet.repeater) for general states
+def _as_bell_diagonal(state):
+    return state if isinstance(state, BellDiagonal) else BellDiagonal.from_qobj(state)
+
+
+def apply_depolarizing_noise(state, p):
+    if isinstance(state, BellDiagonal):
+        return state.depolarize(p)
+    from qnet import repeater
+    return repeater.apply_depolarizing_noise(state, p)
+
+
+def entanglement_swapping(state1, state2, bsm="parity"):
+    bell1 = _as_bell_diagonal(state1)
+    bell2 = _as_bell_diagonal(state2)
+    if bell1 is not None and bell2 is not None:
+        result = bell1.swap(bell2, bsm)
+        # Keep the caller's representation: Qobj in, Qobj out
+        return result if isinstance(state1, BellDiagonal) else result.to_qobj()
+    if bsm != "parity":
+        raise ValueError("The full Bell-state measurement needs Bell-diagonal states")
+    from qnet import repeater
+    state1 = state1.to_qobj() if isinstance(state1, BellDiagonal) else state1
+    state2 = state2.to_qobj() if isinstance(state2, BellDiagonal) else state2
+    return repeater.entanglement_swapping(state1, state2)
+
+
+def bell_fidelity(state):
+    if isinstance(state, BellDiagonal):
+        return state.fidelity()
+    from qnet.metrics import fidelity
+    from qnet.operators import operator
+    return float(fidelity(state, operator("bell_state", (2, 2))))
+
+
+def swap_fidelity(p1, p2):
+    """
+    Fidelity after swapping two Werner links with noise p1 and p2 (scalars or
+    broadcastable arrays), e.g. a whole noise grid in one call.
+    """
+    return BellDiagonal.werner(p1).swap(BellDiagonal.werner(p2)).fidelity()
+
+
+def check_against_qutip(samples=50, seed=0):
+    """
+    Compare the coefficient algebra with the full qutip path on random
+    Bell-diagonal states. Raises AssertionError on any mismatch.
+    """
+    from qutip import fidelity
+    from qnet import repeater
+
+    rng = np.random.default_rng(seed)
+    ideal = repeater.create_bell_state()
+    assert np.allclose(BellDiagonal.bell().to_qobj().full(), ideal.full())
+    for _ in range(samples):
+        bell1 = BellDiagonal(rng.dirichlet(np.ones(4)))
+        bell2 = BellDiagonal(rng.dirichlet(np.ones(4)))
+        p = rng.random()
+
+        noisy = repeater.apply_depolarizing_noise(bell1.to_qobj(), p)
+        assert np.allclose(bell1.depolarize(p).to_qobj().full(), noisy.full())
+
+        swapped = repeater.entanglement_swapping(bell1.to_qobj(), bell2.to_qobj())
+        assert np.allclose(bell1.swap(bell2).to_qobj().full(), swapped.full())
+        assert np.isclose(bell1.swap(bell2).fidelity(), fidelity(swapped, ideal))
+
+    # Full Bell measurement: every outcome k = x + 2z on the middle qubits is
+    # corrected with X^x then Z^z on the last qubit, summed over outcomes
+    vectors = _bell_vectors()
+    pauli_x, pauli_z = np.array([[0, 1], [1, 0]]), np.diag([1, -1])
+    for _ in range(5):
+        bell1 = BellDiagonal(rng.dirichlet(np.ones(4)))
+        bell2 = BellDiagonal(rng.dirichlet(np.ones(4)))
+        rho = np.kron(bell1.to_qobj().full(), bell2.to_qobj().full())
+        out = np.zeros((4, 4), dtype=complex)
+        for k in range(4):
+            correction = np.linalg.matrix_power(pauli_z, k >> 1) @ np.linalg.matrix_power(pauli_x, k & 1)
+            op = np.kron(np.kron(np.eye(2), vectors[k][None, :]), correction)  # (4, 16): measure and correct
+            out += op @ rho @ op.conj().T
+        assert np.allclose(bell1.swap(bell2, "full").to_qobj().full(), out)
+
+    # General (non Bell-diagonal) states fall back to qutip
+    from qutip import rand_dm
+    general = rand_dm([2, 2])
+    assert BellDiagonal.from_qobj(general) is None
+    assert np.allclose(entanglement_swapping(general, ideal).full(),
+                       repeater.entanglement_swapping(general, ideal).full())
+
+
+if __name__ == "__main__":
+    check_against_qutip()
+    print("Bell-diagonal algebra matches the qutip path")
@@ -0,0 +1,315 @@
+"""
+Content-addressed on-disk cache for simulation results.
+
+A result is stored under the SHA-256 of the function's qualified name, its
+parameters, the seed and the code version (a hash of the function's module
+source and of every qnet source file), so editing the simulation code or
+anything it calls invalidates its entries. Entries are
+compressed .npz files. Every hit refreshes the file's modification time, and
+once the directory grows past max_bytes the least recently used entries are
+deleted.
+
+Cacheable results are numbers, arrays, strings, and tuples, lists or dicts
+(with string keys) of those.
+"""
+import functools
+import hashlib
+import inspect
+import json
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+# Root of the qnet sources, hashed into the default code version
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Default location, overridable with the QNET_CACHE_DIR environment variable
+DEFAULT_DIR = os.path.join(os.path.expanduser("~"), ".cache", "qnet")
+MAX_BYTES = 1 << 30
+SUFFIX = ".npz"
+
+
+@functools.lru_cache(maxsize=None)
+def _source_hash(module_name):
+    # Code version: hash of the module source (falls back to the module name)
+    module = sys.modules.get(module_name)
+    try:
+        source = inspect.getsource(module).encode()
+    except (TypeError, OSError):
+        source = module_name.encode()
+    return hashlib.sha256(source).hexdigest()[:16]
+
+
+def _tree_hash(directory):
+    # Hash of the relative paths and contents of every .py file below directory
+    digest = hashlib.sha256()
+    for root, dirs, files in os.walk(directory):
+        dirs[:] = sorted(d for d in dirs if d != "__pycache__")
+        for name in sorted(files):
+            if name.endswith(".py"):
+                path = os.path.join(root, name)
+                digest.update(os.path.relpath(path, directory).encode())
+                with open(path, "rb") as f:
+                    digest.update(hashlib.sha256(f.read()).digest())
+    return digest.hexdigest()[:16]
+
+
+@functools.lru_cache(maxsize=None)
+def _code_version(module_name):
+    # The function's own module (it may live outside qnet) plus the whole qnet
+    # tree, so editing a dependency such as qnet.metrics under qnet.batch counts
+    return _source_hash(module_name) + _tree_hash(PACKAGE_DIR)
+
+
+def _canonical(value):
+    # JSON-serializable, deterministic form of a parameter
+    if isinstance(value, np.random.SeedSequence):
+        return {"entropy": str(value.entropy), "spawn_key": list(value.spawn_key)}
+    if isinstance(value, np.ndarray):
+        return {"dtype": value.dtype.str, "shape": list(value.shape),
+                "sha256": hashlib.sha256(np.ascontiguousarray(value).tobytes()).hexdigest()}
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in sorted(value.items(), key=lambda item: str(item[0]))}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if isinstance(value, float):
+        return repr(value)  # exact round trip
+    if value is None or isinstance(value, (bool, int, str)):
+        return value
+    raise TypeError(f"Cannot build a cache key from {type(value).__name__}")
+
+
+def result_key(func, params, seed=None, version=None):
+    """
+    Hex digest identifying func(params) under seed and code version.
+    Parameters:
+    - func: the function (its module and qualified name enter the key)
+    - params: parameters (numbers, strings, arrays, lists, tuples, dicts)
+    - seed: seed or SeedSequence of the run
+    - version: code version (default: hash of the function's module source
+      and of the qnet sources)
+    """
+    version = _code_version(func.__module__) if version is None else version
+    payload = json.dumps({
+        "func": f"{func.__module__}.{func.__qualname__}",
+        "params": _canonical(params),
+        "seed": _canonical(seed),
+        "version": version,
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _to_arrays(value):
+    # Result -> (kind, {name: array}); object arrays would need pickle and are refused
+    if isinstance(value, dict):
+        kind, items = "dict", {str(k): v for k, v in value.items()}
+    elif isinstance(value, (tuple, list)):
+        kind, items = type(value).__name__, {f"item_{i}": v for i, v in enumerate(value)}
+    else:
+        kind, items = "value", {"value": value}
+    arrays = {}
+    for name, item in items.items():
+        array = np.asarray(item)
+        if array.dtype == object:
+            raise TypeError(f"Cannot cache a result containing {type(item).__name__}")
+        arrays[name] = array
+    return kind, arrays
+
+
+def _from_arrays(kind, arrays):
+    def unwrap(array):
+        return array.item() if array.ndim == 0 else array
+    if kind == "dict":
+        return {name: unwrap(array) for name, array in arrays.items()}
+    if kind in ("tuple", "list"):
+        items = [unwrap(arrays[f"item_{i}"]) for i in range(len(arrays))]
+        return tuple(items) if kind == "tuple" else items
+    return unwrap(arrays["value"])
+
+
+class ResultCache:
+    """
+    Directory of compressed results with a size cap and LRU eviction.
+    Parameters:
+    - directory: cache directory (default: $QNET_CACHE_DIR or ~/.cache/qnet)
+    - max_bytes: total size above which least recently used entries are deleted
+    """
+
+    def __init__(self, directory=None, max_bytes=MAX_BYTES):
+        self.directory = directory or os.environ.get("QNET_CACHE_DIR", DEFAULT_DIR)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(self.directory, exist_ok=True)
+        # Running total of entry sizes; the directory is only rescanned when it exceeds the cap
+        self._bytes = sum(size for _, size, _ in self._entries())
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + SUFFIX)
+
+    def load(self, key):
+        """
+        Stored result for key, or raise KeyError. Counts a hit or a miss.
+        """
+        path = self._path(key)
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                kind = str(data["__kind__"])
+                arrays = {name: data[name] for name in data.files if name != "__kind__"}
+            os.utime(path)  # mark as recently used
+        except (OSError, KeyError, ValueError):
+            self.misses += 1
+            raise KeyError(key) from None
+        self.hits += 1
+        return _from_arrays(kind, arrays)
+
+    def store(self, key, value):
+        kind, arrays = _to_arrays(value)
+        # Write to a temporary file and rename, so readers never see a partial entry
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez_compressed(f, __kind__=np.array(kind), **arrays)
+            size = os.path.getsize(tmp)
+            os.replace(tmp, self._path(key))
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        self._bytes += size
+        if self._bytes > self.max_bytes:
+            self._evict()
+
+    def _entries(self):
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(SUFFIX):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def _evict(self):
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            self.evictions += 1
+        self._bytes = total
+
+    def call(self, func, *args, **kwargs):
+        """
+        func(*args, **kwargs), served from the cache when the same call was stored
+        before (a seed argument is part of the parameters).
+        """
+        key = result_key(func, [args, kwargs])
+        try:
+            return self.load(key)
+        except KeyError:
+            value = func(*args, **kwargs)
+            self.store(key, value)
+            return value
+
+    def clear(self):
+        for _, _, path in self._entries():
+            os.unlink(path)
+        self._bytes = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        entries = self._entries()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": len(entries),
+            "bytes": sum(size for _, size, _ in entries),
+        }
+
+    def report(self):
+        stats = self.stats()
+        print(f"Cache {self.directory}: {stats['hits']} hits, {stats['misses']} misses "
+              f"(hit ratio {stats['hit_ratio']:.1%}), {stats['entries']} entries, "
+              f"{stats['bytes'] / 2**20:.2f} MiB")
+        return stats
+
+
+def cached(cache=None):
+    """
+    Decorator: memoize a function in a ResultCache (the default one if None,
+    created on first call). The cache is available as the wrapper's .cache.
+    """
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if wrapper.cache is None:
+                wrapper.cache = ResultCache()
+            return wrapper.cache.call(func, *args, **kwargs)
+        wrapper.cache = cache
+        return wrapper
+    return decorate
+
+
+def check_cache():
+    """
+    Round-trip results through a temporary cache and exercise eviction.
+    Raises AssertionError on any mismatch.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        cache = ResultCache(directory, max_bytes=1 << 20)
+        values = [0.25, np.arange(10), (1, np.ones(3)), {"00": 512, "11": 512}, ["a", 2.5]]
+        for i, value in enumerate(values):
+            key = result_key(check_cache, i, seed=i)
+            cache.store(key, value)
+            loaded = cache.load(key)
+            assert type(loaded) is type(value) or isinstance(value, np.ndarray)
+            assert repr(_canonical(loaded)) == repr(_canonical(value)), value
+
+        # Different seeds and parameters give different keys
+        assert result_key(check_cache, 1, seed=0) != result_key(check_cache, 1, seed=1)
+        assert result_key(check_cache, 1.0) != result_key(check_cache, 1.0000000001)
+        seq = np.random.SeedSequence(7).spawn(3)[2]
+        assert result_key(check_cache, 1, seq) == result_key(check_cache, 1, np.random.SeedSequence(7).spawn(3)[2])
+
+        calls = []
+
+        def square(x):
+            calls.append(x)
+            return x * x
+        assert cache.call(square, 3) == 9 and cache.call(square, 3) == 9 and calls == [3]
+
+        # Entries beyond the cap are evicted, least recently used first
+        small = ResultCache(os.path.join(directory, "small"), max_bytes=5000)
+        rng = np.random.default_rng(0)
+        for i in range(10):
+            small.store(result_key(check_cache, i), rng.random(200))
+        assert small.stats()["bytes"] <= 5000 and small.evictions > 0
+
+        # Editing any file of a source tree (e.g. a dependency) changes the code version
+        source = os.path.join(directory, "src")
+        os.makedirs(source)
+        for name in ("model.py", "dependency.py"):
+            with open(os.path.join(source, name), "w") as f:
+                f.write("RATE = 0.5\n")
+        before = _tree_hash(source)
+        with open(os.path.join(source, "dependency.py"), "a") as f:
+            f.write("RATE = 0.25\n")
+        after = _tree_hash(source)
+        assert before != after
+        assert result_key(check_cache, 1, version=before) != result_key(check_cache, 1, version=after)
+        assert _code_version(check_cache.__module__).endswith(_tree_hash(PACKAGE_DIR))
+
+
+if __name__ == "__main__":
+    check_cache()
+    print("Result cache round trips and evicts correctly")
@@ -0,0 +1,144 @@
+"""
+Single-qubit noise channels applied locally to multi-qubit states.
+
+A channel is a stack of Kraus operators K_k (shape: (k, 2, 2)). Applying it
+to qubit q of an n-qubit density matrix views ρ as a tensor with 2n axes of
+size 2 and contracts the row and column axis of q with K_k and K_k†. The
+Kraus sum is first folded into a 4x4 superoperator Σ_k K_k ⊗ K_k*, so each
+qubit costs one (4, 4) x (4, 4^(n-1)) matrix product: the state keeps its
+shape and the 2^n x 2^n operator K_k ⊗ I never exists. Kets are turned
+into density matrices first, since noise leaves them mixed.
+"""
+import numpy as np
+
+CHANNELS = ("depolarizing", "dephasing", "amplitude_damping")
+# Largest valid parameter per channel: depolarizing up to 4/3 (the Kraus
+# weight 1 - 3p/4 stays non-negative), probabilities up to 1 otherwise
+MAX_PARAMETER = {"depolarizing": 4 / 3, "dephasing": 1.0, "amplitude_damping": 1.0}
+
+_I = np.eye(2, dtype=complex)
+_X = np.array([[0, 1], [1, 0]], dtype=complex)
+_Y = np.array([[0, -1j], [1j, 0]])
+_Z = np.array([[1, 0], [0, -1]], dtype=complex)
+
+
+def depolarizing(p):
+    # ρ -> (1-p)ρ + p I/2
+    return np.stack([np.sqrt(1 - 3 * p / 4) * _I, np.sqrt(p / 4) * _X, np.sqrt(p / 4) * _Y, np.sqrt(p / 4) * _Z])
+
+
+def dephasing(p):
+    # Z flip with probability p
+    return np.stack([np.sqrt(1 - p) * _I, np.sqrt(p) * _Z])
+
+
+def amplitude_damping(gamma):
+    # |1> decays to |0> with probability gamma
+    return np.array([[[1, 0], [0, np.sqrt(1 - gamma)]],
+                     [[0, np.sqrt(gamma)], [0, 0]]], dtype=complex)
+
+
+def kraus(channel, p):
+    """
+    Kraus operators of a named channel.
+    Parameters:
+    - channel: "depolarizing", "dephasing" or "amplitude_damping"
+    - p: noise probability (damping probability gamma for amplitude damping),
+      in [0, MAX_PARAMETER[channel]]
+    Returns:
+    - kraus: array of shape (k, 2, 2)
+    """
+    if channel not in CHANNELS:
+        raise ValueError(f"channel must be one of {CHANNELS}, got {channel!r}")
+    if not 0 <= p <= MAX_PARAMETER[channel]:
+        raise ValueError(f"{channel} parameter must be in [0, {MAX_PARAMETER[channel]:.4g}], got {p}")
+    return {"depolarizing": depolarizing, "dephasing": dephasing, "amplitude_damping": amplitude_damping}[channel](p)
+
+
+def apply_channel(state, kraus_ops, qubits=None):
+    """
+    Apply a single-qubit channel independently to chosen qubits.
+    Parameters:
+    - state: n-qubit density matrix or ket, as a qutip Qobj or a NumPy array
+      (shape: (2^n, 2^n) or (2^n,) / (2^n, 1)); a ket is expanded to a dense
+      2^n x 2^n density matrix, so memory grows as 4^n either way
+    - kraus_ops: Kraus operators (shape: (k, 2, 2)), e.g. from kraus()
+    - qubits: qubit indices (qubit 0 is the leftmost tensor factor; default: all)
+    Returns:
+    - rho: density matrix of the same dimension (a Qobj with the input's dims
+      if the input was a Qobj, else an array of shape (2^n, 2^n))
+    """
+    qobj = hasattr(state, "full")
+    dims = None
+    if qobj:
+        dims = state.dims[0]
+        state = state.full()
+    state = np.asarray(state, dtype=complex)
+    if state.ndim == 1 or state.shape[1] == 1:
+        ket = state.reshape(-1)
+        state = np.outer(ket, ket.conj())
+    dim = state.shape[0]
+    n = dim.bit_length() - 1
+    if dim != 1 << n:
+        raise ValueError(f"State dimension {dim} is not a power of two")
+    qubits = range(n) if qubits is None else qubits
+
+    kraus_ops = np.asarray(kraus_ops, dtype=complex)
+    # superop[(a, d), (b, c)] = Σ_k K[a, b] K*[d, c]
+    superop = np.einsum('kab,kdc->adbc', kraus_ops, kraus_ops.conj()).reshape(4, 4)
+    rho = state.reshape((2,) * (2 * n))
+    for q in qubits:
+        # Row axis q and column axis n + q to the front, contract, move back
+        front = np.moveaxis(rho, (q, n + q), (0, 1))
+        shape = front.shape
+        front = (superop @ front.reshape(4, -1)).reshape(shape)
+        rho = np.moveaxis(front, (0, 1), (q, n + q))
+    rho = np.ascontiguousarray(rho).reshape(dim, dim)
+    if qobj:
+        from qutip import Qobj
+        return Qobj(rho, dims=[dims, dims])
+    return rho
+
+
+def check_against_qutip(num_qubits=4, samples=5, seed=0):
+    """
+    Compare apply_channel with the full-size Σ_k (K_k ⊗ I) ρ (K_k ⊗ I)†
+    built with qutip. Raises AssertionError on any mismatch.
+    """
+    from qutip import Qobj, qeye, rand_dm, rand_ket, tensor
+
+    rng = np.random.default_rng(seed)
+    for _ in range(samples):
+        dims = [2] * num_qubits
+        rho = rand_dm(dims, seed=int(rng.integers(1 << 31)))
+        for channel in CHANNELS:
+            ops = kraus(channel, rng.random())
+            qubits = sorted(rng.choice(num_qubits, 2, replace=False).tolist())
+            expected = rho
+            for q in qubits:
+                full = [tensor([Qobj(k) if i == q else qeye(2) for i in range(num_qubits)]) for k in ops]
+                expected = sum(k * expected * k.dag() for k in full)
+            result = apply_channel(rho, ops, qubits)
+            assert result.dims == rho.dims
+            assert np.allclose(result.full(), expected.full()), channel
+            assert np.isclose(result.tr(), 1.0)
+
+    # Kets become density matrices; NumPy input stays NumPy
+    ket = rand_ket([2] * num_qubits, seed=seed)
+    ops = kraus("depolarizing", 0.3)
+    assert np.allclose(apply_channel(ket, ops).full(), apply_channel(ket.full().ravel(), ops))
+    # Out-of-range parameters are rejected instead of giving nan Kraus operators
+    for channel, p in (("depolarizing", 1.4), ("dephasing", 1.1), ("amplitude_damping", -0.1)):
+        try:
+            kraus(channel, p)
+        except ValueError:
+            continue
+        raise AssertionError(f"{channel} accepted p={p}")
+    assert np.all(np.isfinite(kraus("depolarizing", 4 / 3)))
+    # Full depolarization of every qubit gives the maximally mixed state
+    assert np.allclose(apply_channel(ket, kraus("depolarizing", 1.0)).full(), np.eye(1 << num_qubits) / (1 << num_qubits))
+
+
+if __name__ == "__main__":
+    check_against_qutip()
+    print("Local channels match the full-size qutip operators")
@@ -0,0 +1,233 @@
+"""
+Command line entry point: one subcommand per protocol.
+
+    python -m qnet bb84 --qubits 100
+    python -m qnet e91 --rounds 1000
+    python -m qnet e91 --rounds 10000000 --noise 0.1
+    python -m qnet repeater --workers 4
+    python -m qnet repeater --batched --points 100000
+    python -m qnet chain --segments 1000 --noise 0.01 --order nested
+    python -m qnet chain --segments 1024 --order nested --bsm full --level-rounds 1
+    python -m qnet events --segments 8 --schedule nested --cutoff 0.05
+    python -m qnet waiting --trials 10000000 --protocol doubling
+    python -m qnet ae --nodes 5
+    python -m qnet ae --nodes 300 --backend mps
+    python -m qnet route --nodes 5000 --queries 10000 --metric fidelity
+    python -m qnet error-correction --shots 1024
+    python -m qnet --cache repeater          # reuse results stored by earlier runs
+
+Each subcommand imports its protocol module (and qutip, qiskit or
+matplotlib) only when it runs; --timing reports the start-up and run time.
+"""
+import argparse
+import sys
+import time
+
+# Set when this module is first imported; start-up time is measured from here
+_IMPORTED_AT = time.perf_counter()
+
+
+def _cache(args):
+    # ResultCache when --cache is given, else None
+    if not args.cache:
+        return None
+    from qnet.cache import ResultCache
+
+    return ResultCache(args.cache_dir)
+
+
+def _bb84(args):
+    from qnet.bb84 import simulate
+
+    cache = _cache(args)
+    simulate(num_qubits=args.qubits, seed=args.seed, workers=args.workers, plot=not args.no_plot, cache=cache)
+    if cache is not None:
+        cache.report()
+
+
+def _e91(args):
+    from qnet.e91 import simulate_e91
+
+    simulate_e91(rounds=args.rounds, noise=args.noise, seed=args.seed)
+
+
+def _repeater(args):
+    from qnet.repeater import simulate_network
+
+    cache = _cache(args)
+    simulate_network(seed=args.seed, workers=args.workers, plot=not args.no_plot,
+                     points=args.points, batched=args.batched, cache=cache)
+    if cache is not None:
+        cache.report()
+
+
+def _chain(args):
+    from qnet.repeater import repeater_chain
+
+    _, fidelity = repeater_chain(args.segments, args.noise, order=args.order,
+                                 distill_rounds=args.distill_rounds, level_rounds=args.level_rounds,
+                                 schedule=args.schedule, protocol=args.protocol, bsm=args.bsm)
+    print(f"{args.segments} segments ({args.order}, {args.bsm} swaps): end-to-end fidelity = {fidelity:.6f}")
+
+
+def _events(args):
+    from qnet.eventsim import simulate_events
+
+    stats = simulate_events(args.segments, segment_length=args.length, link_success=args.link_success,
+                            link_noise=args.noise, t2=args.t2, cutoff=args.cutoff, schedule=args.schedule,
+                            bsm=args.bsm, max_pairs=args.pairs, duration=args.duration, seed=args.seed)
+    for percentile, value in stats["fidelity_percentiles"].items():
+        print(f"fidelity p{percentile}: {value:.6f}")
+
+
+def _waiting(args):
+    from qnet.waiting import estimate_waiting_time
+
+    estimate_waiting_time(args.trials, args.segments, args.protocol, link_success=args.link_success,
+                          segment_length=args.length, swap_success=args.swap_success,
+                          seed=args.seed, workers=args.workers)
+
+
+def _ae(args):
+    from qnet.ae import simulate_routing
+
+    simulate_routing(num_nodes=args.nodes, noise_prob=args.noise, channel=args.channel, backend=args.backend)
+
+
+def _route(args):
+    import numpy as np
+
+    from qnet.topology import Router, Topology
+
+    rng = np.random.default_rng(args.seed)
+    topology = Topology.random_geometric(args.nodes, radius=args.radius, rng=rng)
+    router = Router(topology, args.metric)
+    pairs = rng.integers(0, args.nodes, size=(args.queries, 2))
+    start = time.perf_counter()
+    _, values = router.route_many(pairs, paths=False)
+    elapsed = time.perf_counter() - start
+    routed = ~np.isnan(values)
+    print(f"{topology}: {args.queries} {args.metric} queries in {elapsed:.3f} s, "
+          f"{routed.mean():.1%} routable, mean {args.metric} {values[routed & np.isfinite(values)].mean():.4g}")
+
+
+def _error_correction(args):
+    from qnet.error_correction import bit_flip_code_circuit, draw_circuit, run_circuit
+
+    cache = _cache(args)
+    if cache is not None and args.seed is None:
+        print("--cache only stores seeded runs; pass --seed to reuse results")
+    qc = bit_flip_code_circuit(None if args.error_qubit < 0 else args.error_qubit)
+    print(run_circuit(qc, shots=args.shots, seed=args.seed, cache=cache, backend=args.backend))
+    if cache is not None:
+        cache.report()
+    if args.draw:
+        draw_circuit(qc)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="qnet", description="Quantum networking protocol simulations")
+    parser.add_argument("--timing", action="store_true", help="report start-up and run time")
+    parser.add_argument("--cache", action="store_true", help="reuse stored results (bb84, repeater, seeded error-correction)")
+    parser.add_argument("--cache-dir", default=None, help="cache directory (default: $QNET_CACHE_DIR or ~/.cache/qnet)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    bb84 = commands.add_parser("bb84", help="BB84 key exchange and success-rate sweep")
+    bb84.add_argument("--qubits", type=int, default=100)
+    bb84.add_argument("--seed", type=int, default=2024)
+    bb84.add_argument("--workers", type=int, default=None)
+    bb84.add_argument("--no-plot", action="store_true")
+    bb84.set_defaults(func=_bb84)
+
+    e91 = commands.add_parser("e91", help="E91 entanglement-based key exchange")
+    e91.add_argument("--rounds", type=int, default=1000)
+    e91.add_argument("--noise", type=float, default=0.0, help="depolarizing probability per pair")
+    e91.add_argument("--seed", type=int, default=None)
+    e91.set_defaults(func=_e91)
+
+    repeater = commands.add_parser("repeater", help="entanglement swapping fidelity vs. noise")
+    repeater.add_argument("--seed", type=int, default=0)
+    repeater.add_argument("--workers", type=int, default=None)
+    repeater.add_argument("--no-plot", action="store_true")
+    repeater.add_argument("--points", type=int, default=20, help="number of noise levels")
+    repeater.add_argument("--batched", action="store_true", help="evaluate all noise levels as one array stack")
+    repeater.set_defaults(func=_repeater)
+
+    chain = commands.add_parser("chain", help="end-to-end fidelity of an N-segment repeater chain")
+    chain.add_argument("--segments", type=int, default=100)
+    chain.add_argument("--noise", type=float, default=0.01, help="depolarizing probability per link")
+    chain.add_argument("--order", choices=["sequential", "nested"], default="sequential")
+    chain.add_argument("--distill-rounds", type=int, default=0, help="distillation rounds per elementary link")
+    chain.add_argument("--level-rounds", type=int, default=0,
+                       help="distillation rounds after each nesting level (needs --bsm full)")
+    chain.add_argument("--schedule", choices=["recurrence", "pumping"], default="recurrence")
+    chain.add_argument("--protocol", choices=["dejmps", "bbpssw"], default="dejmps")
+    chain.add_argument("--bsm", choices=["parity", "full"], default="parity",
+                       help="swap: parity projection or full Bell measurement with correction")
+    chain.set_defaults(func=_chain)
+
+    events = commands.add_parser("events", help="discrete-event repeater chain with timing and decoherence")
+    events.add_argument("--segments", type=int, default=8)
+    events.add_argument("--length", type=float, default=10e3, help="segment length in metres")
+    events.add_argument("--link-success", type=float, default=0.1, help="success probability per attempt")
+    events.add_argument("--noise", type=float, default=0.02, help="depolarizing probability per link")
+    events.add_argument("--t2", type=float, default=1.0, help="memory dephasing time in seconds")
+    events.add_argument("--cutoff", type=float, default=None, help="memory cutoff in seconds")
+    events.add_argument("--schedule", choices=["swap_asap", "nested"], default="swap_asap")
+    events.add_argument("--bsm", choices=["full", "parity"], default="full")
+    events.add_argument("--pairs", type=int, default=1000, help="stop after this many delivered pairs")
+    events.add_argument("--duration", type=float, default=None, help="stop after this many simulated seconds")
+    events.add_argument("--seed", type=int, default=None)
+    events.set_defaults(func=_events)
+
+    waiting = commands.add_parser("waiting", help="Monte Carlo end-to-end delivery time distribution")
+    waiting.add_argument("--trials", type=int, default=10_000_000)
+    waiting.add_argument("--segments", type=int, default=8)
+    waiting.add_argument("--protocol", choices=["swap_asap", "doubling"], default="swap_asap")
+    waiting.add_argument("--link-success", type=float, default=0.1, help="success probability per attempt")
+    waiting.add_argument("--length", type=float, default=10e3, help="segment length in metres")
+    waiting.add_argument("--swap-success", type=float, default=1.0, help="swap success probability (doubling)")
+    waiting.add_argument("--seed", type=int, default=0)
+    waiting.add_argument("--workers", type=int, default=None)
+    waiting.set_defaults(func=_waiting)
+
+    ae = commands.add_parser("ae", help="routing along the a-e line network")
+    ae.add_argument("--nodes", type=int, default=5)
+    ae.add_argument("--noise", type=float, default=0.05)
+    ae.add_argument("--channel", choices=["depolarizing", "dephasing", "amplitude_damping"], default="depolarizing")
+    ae.add_argument("--backend", choices=["qutip", "mps"], default="qutip",
+                    help="mps: matrix product state, for lines of hundreds of nodes")
+    ae.set_defaults(func=_ae)
+
+    route = commands.add_parser("route", help="batched routing on a random geometric mesh")
+    route.add_argument("--nodes", type=int, default=1000)
+    route.add_argument("--radius", type=float, default=None, help="link range in metres (default: ~8 neighbours)")
+    route.add_argument("--queries", type=int, default=1000, help="random source-destination pairs")
+    route.add_argument("--metric", choices=["fidelity", "hops", "rate"], default="fidelity")
+    route.add_argument("--seed", type=int, default=0)
+    route.set_defaults(func=_route)
+
+    error_correction = commands.add_parser("error-correction", help="three-qubit bit-flip code")
+    error_correction.add_argument("--error-qubit", type=int, default=1, help="-1 for no error")
+    error_correction.add_argument("--shots", type=int, default=1024)
+    error_correction.add_argument("--draw", action="store_true")
+    error_correction.add_argument("--seed", type=int, default=None, help="simulator seed")
+    error_correction.add_argument("--backend", choices=["aer", "stabilizer", "auto"], default="aer",
+                                  help="circuit sampler (stabilizer: bit-packed Clifford tableau)")
+    error_correction.set_defaults(func=_error_correction)
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == "chain" and args.level_rounds and args.bsm == "parity":
+        # Distilling a parity-swap output cannot raise its fidelity above 1/2
+        parser.error("chain: --level-rounds needs --bsm full")
+    started = time.perf_counter()
+    args.func(args)
+    if args.timing:
+        finished = time.perf_counter()
+        print(f"[timing] start-up {(started - _IMPORTED_AT) * 1e3:.1f} ms, "
+              f"{args.command} {(finished - started) * 1e3:.1f} ms", file=sys.stderr)
+    return 0
@@ -0,0 +1,207 @@
+import numpy as np
+
+# Measurement angles in the X-Z plane (observable cos θ Z + sin θ X), Ekert's sets
+ALICE_ANGLES = np.array([0.0, np.pi / 4, np.pi / 2])
+BOB_ANGLES = np.array([np.pi / 4, np.pi / 2, 3 * np.pi / 4])
+
+# Correlation E(a, b) = <A ⊗ B> of |Φ⁺⟩, indexed by [alice_basis, bob_basis]
+CORRELATION = np.cos(ALICE_ANGLES[:, None] - BOB_ANGLES[None, :])
+
+# Compatible bases (equal angles): these rounds form the key
+KEY_BASES = np.isclose(ALICE_ANGLES[:, None], BOB_ANGLES[None, :])
+
+# CHSH signs: S = E(a1, b1) - E(a1, b3) + E(a3, b1) + E(a3, b3), 2√2 for |Φ⁺⟩
+CHSH_SIGNS = np.array([[1, 0, -1],
+                       [0, 0, 0],
+                       [1, 0, 1]])
+
+# Rounds drawn per batch in run_e91 (bounds temporary memory)
+CHUNK = 1 << 22
+
+# Outcome draws are 32-bit: the top bit is Alice's outcome, the low 31 bits
+# decide whether Bob's outcome differs
+_LOW_BITS = np.uint32((1 << 31) - 1)
+
+
+def _rng(rng):
+    return rng if rng is not None else np.random.default_rng()
+
+
+def born_table(noise=0.0):
+    """
+    Joint outcome probabilities of the shared pair for every basis choice.
+    The pair is the Werner state (1-p)|Φ⁺⟩⟨Φ⁺| + p I/4; outcome 0 is the +1
+    eigenvalue. Both marginals are uniform and the outcomes differ with
+    probability (1 - (1-p) E) / 2.
+    Parameters:
+    - noise: depolarizing probability p of the pair
+    Returns:
+    - table: array of shape (3, 3, 2, 2) indexed by [alice_basis, bob_basis, a, b]
+    """
+    differ = (1 - (1 - noise) * CORRELATION) / 2
+    table = np.empty((3, 3, 2, 2))
+    table[..., 0, 0] = table[..., 1, 1] = (1 - differ) / 2
+    table[..., 0, 1] = table[..., 1, 0] = differ / 2
+    return table
+
+
+def _thresholds(noise):
+    # Per basis pair (flattened as 3 * alice + bob): Bob's outcome differs
+    # when the low 31 bits of the draw fall below the threshold
+    table = born_table(noise)
+    differ = (table[..., 0, 1] + table[..., 1, 0]).ravel()
+    return np.round(differ * (1 << 31)).astype(np.uint32)
+
+
+def _draw(rounds, thresholds, rng):
+    # (pair, alice_bits, bob_bits): one draw for the basis pair, one for the outcomes
+    pair = rng.integers(0, 9, rounds, dtype=np.uint8)
+    draw = rng.integers(0, 1 << 32, rounds, dtype=np.uint32)
+    alice_bits = (draw >> np.uint32(31)).astype(np.uint8)
+    bob_bits = alice_bits ^ ((draw & _LOW_BITS) < thresholds[pair])
+    return pair, alice_bits, bob_bits
+
+
+def measure_pairs(rounds, noise=0.0, rng=None):
+    """
+    Alice and Bob each pick one of their three E91 angles and measure their
+    half of the pair; joint outcomes are sampled from born_table() in one
+    batched draw.
+    Returns:
+    - alice_bases, bob_bases: uint8 arrays of angle indices (0-2)
+    - alice_bits, bob_bits: uint8 arrays of outcomes
+    """
+    pair, alice_bits, bob_bits = _draw(rounds, _thresholds(noise), _rng(rng))
+    alice_bases, bob_bases = np.divmod(pair, np.uint8(3))
+    return alice_bases, bob_bases, alice_bits, bob_bits
+
+
+def chsh_value(alice_bases, bob_bases, alice_bits, bob_bits):
+    """
+    CHSH S parameter estimated from measured rounds.
+    Returns:
+    - s_value: S (|S| > 2 violates the classical bound, 2√2 is the quantum maximum)
+    - correlations: estimated E per basis pair (shape: (3, 3))
+    """
+    pair = np.asarray(alice_bases, dtype=np.intp) * 3 + np.asarray(bob_bases)
+    parity = np.asarray(alice_bits) ^ np.asarray(bob_bits)
+    counts = np.bincount(2 * pair + parity, minlength=18).reshape(3, 3, 2)
+    return _chsh(counts)
+
+
+def _chsh(counts):
+    # counts[alice_basis, bob_basis, parity] -> (S, E)
+    total = counts.sum(axis=-1)
+    correlations = (counts[..., 0] - counts[..., 1]) / np.maximum(total, 1)
+    return float(np.sum(CHSH_SIGNS * correlations)), correlations
+
+
+def sift(alice_bases, bob_bases, alice_bits, bob_bits):
+    """
+    Keep the rounds measured in compatible bases.
+    Returns:
+    - key_alice, key_bob: uint8 arrays of key bits
+    """
+    keep = KEY_BASES[alice_bases, bob_bases]
+    return alice_bits[keep], bob_bits[keep]
+
+
+def run_e91(rounds, noise=0.0, chunk_size=CHUNK, rng=None):
+    """
+    Full E91 exchange on uint8 arrays, in batches of chunk_size rounds.
+    Parameters:
+    - rounds: number of measured pairs
+    - noise: depolarizing probability of each pair (see born_table)
+    Returns:
+    - key_alice, key_bob: uint8 arrays of key bits
+    - s_value: CHSH S parameter (estimated from the rounds in CHSH_SIGNS' basis pairs)
+    """
+    rng = _rng(rng)
+    thresholds = _thresholds(noise)
+    key_pairs = KEY_BASES.ravel()
+    counts = np.zeros(18, dtype=np.int64)
+    keys_alice, keys_bob = [], []
+    for start in range(0, rounds, chunk_size):
+        pair, alice_bits, bob_bits = _draw(min(chunk_size, rounds - start), thresholds, rng)
+        counts += np.bincount(2 * pair + (alice_bits ^ bob_bits), minlength=18)
+        keep = key_pairs[pair]
+        keys_alice.append(alice_bits[keep])
+        keys_bob.append(bob_bits[keep])
+    s_value, _ = _chsh(counts.reshape(3, 3, 2))
+    empty = np.zeros(0, dtype=np.uint8)
+    return np.concatenate(keys_alice or [empty]), np.concatenate(keys_bob or [empty]), s_value
+
+
+def simulate_e91(rounds=1000, noise=0.0, seed=None):
+    """
+    E91 demo: Alice and Bob measure their halves of |Φ⁺⟩ at random E91
+    angles, keep the rounds with compatible bases as the key and test the
+    remaining ones against the CHSH inequality.
+    Parameters:
+    - rounds: number of measurement rounds
+    - noise: depolarizing probability of each pair
+    - seed: random seed (None = fresh entropy)
+    Returns:
+    - key_alice, key_bob: key bits from rounds with compatible bases
+    - bell_value: CHSH S parameter
+    """
+    key_alice, key_bob, bell_value = run_e91(rounds, noise, rng=np.random.default_rng(seed))
+
+    print("Generated Key (Alice):", key_alice)
+    print("Generated Key (Bob):", key_bob)
+    print("Key match: ", np.array_equal(key_alice, key_bob))
+    if len(key_alice):
+        print(f"QBER: {np.mean(key_alice != key_bob):.4f}")
+    print(f"CHSH S: {bell_value:.4f} (classical bound 2, quantum maximum {2 * np.sqrt(2):.4f})")
+    return key_alice, key_bob, bell_value
+
+
+def check_e91(rounds=2_000_000, seed=0):
+    """
+    Compare born_table with qutip expectation values on the Bell state and
+    check the sampled key and CHSH estimate. Raises AssertionError on any mismatch.
+    """
+    from qutip import bell_state, ket2dm, qeye, sigmax, sigmaz, tensor
+
+    # Born table against qutip projectors, with and without depolarizing noise
+    def projector(theta, outcome):
+        sign = 1 if outcome == 0 else -1
+        return (qeye(2) + sign * (np.cos(theta) * sigmaz() + np.sin(theta) * sigmax())) / 2
+
+    bell = ket2dm(bell_state("00"))
+    for noise in (0.0, 0.3):
+        rho = (1 - noise) * bell + noise * tensor(qeye(2), qeye(2)) / 4
+        table = born_table(noise)
+        for i, alpha in enumerate(ALICE_ANGLES):
+            for j, beta in enumerate(BOB_ANGLES):
+                for a in (0, 1):
+                    for b in (0, 1):
+                        expected = (rho * tensor(projector(alpha, a), projector(beta, b))).tr().real
+                        assert np.isclose(table[i, j, a, b], expected), (noise, i, j, a, b)
+
+    # Noiseless pairs: identical keys, S close to 2√2; 5 sigma bounds
+    rng = np.random.default_rng(seed)
+    key_alice, key_bob, s_value = run_e91(rounds, chunk_size=rounds // 3, rng=rng)
+    assert np.array_equal(key_alice, key_bob), "keys differ without noise"
+    assert abs(len(key_alice) / rounds - 2 / 9) < 5 * np.sqrt(2 / 9 / rounds)
+    tolerance = 5 * 4 * np.sqrt(9 / rounds)
+    assert abs(s_value - 2 * np.sqrt(2)) < tolerance, s_value
+
+    # Depolarized pairs: S scales with 1-p and the QBER is p/2
+    noise = 0.2
+    key_alice, key_bob, s_value = run_e91(rounds, noise, rng=rng)
+    assert abs(s_value - 2 * np.sqrt(2) * (1 - noise)) < tolerance, s_value
+    assert abs(np.mean(key_alice != key_bob) - noise / 2) < 5 * np.sqrt(9 / 2 / rounds)
+
+    # The array helpers agree with run_e91 on the same stream
+    bases_bits = measure_pairs(1000, rng=np.random.default_rng(seed))
+    key_alice, _ = sift(*bases_bits)
+    ref_alice, _, ref_s = run_e91(1000, rng=np.random.default_rng(seed))
+    assert np.array_equal(key_alice, ref_alice)
+    assert np.isclose(chsh_value(*bases_bits)[0], ref_s)
+    return s_value
+
+
+if __name__ == "__main__":
+    s_value = check_e91()
+    print(f"Born table matches qutip; noisy CHSH S = {s_value:.4f}")
@@ -0,0 +1,106 @@
+# Circuit samplers accepted by run_circuit
+BACKENDS = ("aer", "stabilizer", "auto")
+
+
+def bit_flip_code_circuit(error_qubit=1):
+    """
+    Three-qubit bit-flip code with two syndrome ancillas.
+    Parameters:
+    - error_qubit: data qubit (0-2) hit by an artificial X error, or None for no error
+    Returns:
+    - qc: QuantumCircuit with 'syndrome' (2 bits) and 'result' (1 bit) registers
+    """
+    from qiskit import ClassicalRegister, QuantumCircuit, QuantumRegister
+
+    # Create quantum registers
+    qr = QuantumRegister(5, 'qubit')  # 3 data qubits, 2 ancilla
+    cr = ClassicalRegister(2, 'syndrome')  # Stores error information
+    result_reg = ClassicalRegister(1, 'result')  # Final measurement
+    qc = QuantumCircuit(qr, cr, result_reg)
+
+    # Encode logical state (|1> in this example)
+    qc.x(qr[0])  # Prepare |1>
+    qc.cx(qr[0], qr[1])  # Create entanglement
+    qc.cx(qr[0], qr[2])  # Now |111>
+
+    # Introduce artificial error
+    if error_qubit is not None:
+        qc.x(qr[error_qubit])
+
+    # Syndrome measurement
+    qc.barrier()
+    qc.cx(qr[0], qr[3])  # Compare qubit 0 & 1
+    qc.cx(qr[1], qr[3])
+    qc.cx(qr[1], qr[4])  # Compare qubit 1 & 2
+    qc.cx(qr[2], qr[4])
+
+    # Measure ancilla qubits
+    qc.measure(qr[3], cr[0])
+    qc.measure(qr[4], cr[1])
+
+    # Error correction based on syndrome (if_test replaces the removed c_if)
+    qc.barrier()
+    with qc.if_test((cr, 1)):  # 01 -> fix qubit 0
+        qc.x(qr[0])
+    with qc.if_test((cr, 3)):  # 11 -> fix qubit 1
+        qc.x(qr[1])
+    with qc.if_test((cr, 2)):  # 10 -> fix qubit 2
+        qc.x(qr[2])
+
+    # Final measurement
+    qc.measure(qr[0], result_reg[0])
+    return qc
+
+
+def run_circuit(qc, shots=1024, seed=None, cache=None, backend="aer"):
+    """
+    Sample the circuit on the Aer simulator or the stabilizer backend.
+    Parameters:
+    - qc: QuantumCircuit
+    - shots: number of samples
+    - seed: simulator seed (None = unseeded)
+    - cache: optional qnet.cache.ResultCache; results are keyed by the
+      circuit's OpenQASM 3 text, the shots, the backend and the seed
+      (unseeded runs always sample afresh)
+    - backend: "aer", "stabilizer" (qnet.stabilizer, Clifford circuits only)
+      or "auto" (stabilizer, falling back to Aer for non-Clifford circuits)
+    Returns:
+    - counts: dict of measured bitstrings
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"backend must be one of {BACKENDS}, got {backend!r}")
+    if cache is None or seed is None:
+        return _sample(qc, shots, seed, backend)
+    from qiskit import qasm3
+
+    from qnet.cache import result_key
+
+    key = result_key(run_circuit, [qasm3.dumps(qc), shots, backend], seed)
+    try:
+        return cache.load(key)
+    except KeyError:
+        counts = _sample(qc, shots, seed, backend)
+        cache.store(key, counts)
+        return counts
+
+
+def _sample(qc, shots, seed, backend="aer"):
+    if backend != "aer":
+        from qnet.stabilizer import run_counts
+
+        return run_counts(qc, shots, seed, fallback=backend == "auto")[0]
+    from qiskit import transpile
+    from qiskit_aer import AerSimulator
+
+    simulator = AerSimulator(seed_simulator=seed)
+    return simulator.run(transpile(qc, simulator), shots=shots).result().get_counts()
+
+
+def draw_circuit(qc, path=None):
+    import matplotlib.pyplot as plt
+
+    qc.draw('mpl', style='iqp')
+    if path:
+        plt.savefig(path)
+    else:
+        plt.show()
@@ -0,0 +1,184 @@
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+from qnet.bb84 import sifted_key_pair
+from qnet.keys import PackedKey
+from qnet.postprocessing import post_process
+
+# AES key sizes the pool serves, in bits
+KEY_SIZES = (128, 256)
+
+
+class KeyPool:
+    """
+    Buffer of distilled QKD key bits that serves AES keys on demand.
+    Every BB84 round (sifting + post-processing) adds all of its final bits
+    to the pool; nothing is thrown away for a low success rate. A background
+    thread starts refilling when the pool drops below low_water_bits and keeps
+    going until it holds capacity_bits. get_key() counts a hit when the bits
+    are already there and a miss when it has to wait for a refill. If a round
+    raises, the refill thread stops and the exception is re-raised by
+    get_key() (once the buffered bits run out) and by close().
+    Parameters:
+    - capacity_bits: fill level the refill thread stops at
+    - low_water_bits: fill level below which the refill thread starts
+    - round_qubits: raw qubits sent per BB84 round
+    - error_rate: bit-flip error rate of the channel; each round estimates its
+      QBER from the packed sifted keys (XOR + popcount)
+    - seed: seed of the pool's random generator
+    """
+
+    def __init__(self, capacity_bits=1 << 14, low_water_bits=1 << 11, round_qubits=4096,
+                 error_rate=0.0, seed=None):
+        self.capacity_bits = capacity_bits
+        self.low_water_bits = low_water_bits
+        self.round_qubits = round_qubits
+        self.error_rate = error_rate
+        self._rng = np.random.default_rng(seed)
+
+        self._blocks = deque()
+        self._level = 0
+        self._filling = True
+        self._waiters = 0
+        self._closed = False
+        self._error = None
+        self._cond = threading.Condition()
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.refills = 0
+        self.refill_seconds = 0.0
+        self.max_refill_latency = 0.0
+        self.last_success_rate = 0.0
+        self.last_qber = 0.0
+
+        self._thread = threading.Thread(target=self._refill_loop, daemon=True)
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self._level
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+
+    def _round(self):
+        # One BB84 round: sift and distil round_qubits raw qubits
+        alice_key, bob_key = sifted_key_pair(self.round_qubits, self.error_rate, self._rng, packed=True)
+        qber = alice_key.error_rate(bob_key)
+        _, final_key, _ = post_process(alice_key.bits(), bob_key.bits(), qber=qber,
+                                       rng=self._rng, verbose=False)
+        return final_key, len(bob_key) / self.round_qubits, qber
+
+    def _needs_refill(self):
+        return self._waiters > 0 or self._filling or self._level < self.low_water_bits
+
+    def _refill_loop(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._closed or self._needs_refill())
+                if self._closed:
+                    return
+                self._filling = True
+
+            start = time.perf_counter()
+            try:
+                final_key, success_rate, qber = self._round()  # runs without holding the lock
+            except Exception as exc:
+                # Hand the failure to the waiters instead of dying silently
+                with self._cond:
+                    self._error = exc
+                    self._cond.notify_all()
+                return
+            latency = time.perf_counter() - start
+
+            with self._cond:
+                if len(final_key):
+                    self._blocks.append(final_key)
+                    self._level += len(final_key)
+                self.refills += 1
+                self.refill_seconds += latency
+                self.max_refill_latency = max(self.max_refill_latency, latency)
+                self.last_success_rate = success_rate
+                self.last_qber = qber
+                if self._level >= self.capacity_bits:
+                    self._filling = False
+                self._cond.notify_all()
+
+    def _take(self, nbits):
+        out = np.empty(nbits, dtype=np.uint8)
+        filled = 0
+        while filled < nbits:
+            block = self._blocks[0]
+            take = min(len(block), nbits - filled)
+            out[filled:filled + take] = block[:take]
+            filled += take
+            if take == len(block):
+                self._blocks.popleft()
+            else:
+                self._blocks[0] = block[take:]
+        self._level -= nbits
+        return out
+
+    def get_key(self, bits=128, timeout=None):
+        """
+        Remove bits key bits from the pool and return them as AES key material.
+        Blocks until a refill delivers enough bits on a miss; re-raises the
+        refill thread's exception if a round failed.
+        Returns:
+        - key: zero-copy memoryview over a PackedKey buffer (bits // 8 bytes)
+        """
+        if bits not in KEY_SIZES:
+            raise ValueError(f"Key size must be one of {KEY_SIZES}, got {bits}")
+        with self._cond:
+            if self._level >= bits:
+                self.hits += 1
+            else:
+                self.misses += 1
+                self._waiters += 1
+                self._cond.notify_all()
+                self._cond.wait_for(lambda: self._closed or self._error is not None or self._level >= bits,
+                                    timeout)
+                self._waiters -= 1
+                if self._level < bits:
+                    if self._error is not None:
+                        raise self._error
+                    if self._closed:
+                        raise RuntimeError("Key pool is closed")
+                    raise TimeoutError("Key pool could not supply a key in time")
+            key_bits = self._take(bits)
+            if self._level < self.low_water_bits:
+                self._cond.notify_all()
+        return PackedKey.from_bits(key_bits).key_bytes(bits // 8)
+
+    def stats(self):
+        """
+        Snapshot of the pool counters.
+        """
+        with self._cond:
+            requests = self.hits + self.misses
+            return {
+                "level_bits": self._level,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / requests if requests else 0.0,
+                "refills": self.refills,
+                "mean_refill_latency": self.refill_seconds / self.refills if self.refills else 0.0,
+                "max_refill_latency": self.max_refill_latency,
+                "last_success_rate": self.last_success_rate,
+                "last_qber": self.last_qber,
+            }
@@ -0,0 +1,166 @@
+import numpy as np
+
+
+def popcount(words):
+    """
+    Number of set bits in a uint64 word array.
+    """
+    if hasattr(np, 'bitwise_count'):
+        return int(np.bitwise_count(words).sum())
+    return int(np.unpackbits(words.view(np.uint8)).sum())  # numpy < 2.0
+
+
+def popcount_rows(words):
+    """
+    Number of set bits along the last axis of a uint64 word array.
+    """
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(words).sum(axis=-1, dtype=np.int64)
+    bits = np.unpackbits(np.ascontiguousarray(words).view(np.uint8), axis=-1)  # numpy < 2.0
+    return bits.sum(axis=-1, dtype=np.int64)
+
+
+class PackedKey:
+    """
+    Key bits packed 64 to a uint64 word.
+    The bytes follow np.packbits order (first bit in the top bit of byte 0) and
+    the padding bits of the last word are always zero, so whole-word XOR and
+    popcount never see stray bits.
+    """
+
+    def __init__(self, buffer, nbits):
+        self.buffer = buffer                  # uint8, length is a multiple of 8
+        self.words = buffer.view(np.uint64)   # same memory, one word per 64 bits
+        self.nbits = nbits
+
+    @classmethod
+    def from_bits(cls, bits):
+        """
+        Pack a 0/1 sequence (list or uint8 array) into a new PackedKey.
+        """
+        bits = np.asarray(bits, dtype=np.uint8)
+        nbits = len(bits)
+        buffer = np.zeros(-(-nbits // 64) * 8, dtype=np.uint8)
+        packed = np.packbits(bits)
+        buffer[:len(packed)] = packed
+        return cls(buffer, nbits)
+
+    def __len__(self):
+        return self.nbits
+
+    def bits(self):
+        """
+        Unpack back to a uint8 array of 0/1 values.
+        """
+        return np.unpackbits(self.buffer, count=self.nbits)
+
+    def key_bytes(self, nbytes):
+        """
+        Zero-copy memoryview over the first nbytes of the packed key (e.g. 16 for AES-128).
+        """
+        if nbytes * 8 > self.nbits:
+            raise ValueError(f"Key holds {self.nbits} bits, {nbytes * 8} requested")
+        return memoryview(self.buffer)[:nbytes]
+
+    def error_count(self, other):
+        """
+        Number of positions where two keys of equal length differ (XOR + popcount per word).
+        """
+        if self.nbits != other.nbits:
+            raise ValueError("Keys must have the same length to be compared")
+        return popcount(self.words ^ other.words)
+
+    def error_rate(self, other):
+        return self.error_count(other) / self.nbits if self.nbits else 0.0
+
+
+def _valid_mask(nbits):
+    # uint64 words with a 1 in every position that holds a real bit
+    buffer = np.zeros(-(-nbits // 64) * 8, dtype=np.uint8)
+    buffer[:nbits // 8] = 0xFF
+    if nbits % 8:
+        buffer[nbits // 8] = (0xFF << (8 - nbits % 8)) & 0xFF
+    return buffer.view(np.uint64)
+
+
+def _compress_table():
+    # table[byte, mask]: the bits of byte where mask is set, moved to the top
+    byte = np.arange(256, dtype=np.uint16)[:, None]
+    mask = np.arange(256, dtype=np.uint16)[None, :]
+    table = np.zeros((256, 256), dtype=np.uint16)
+    kept = np.zeros((1, 256), dtype=np.uint16)
+    for bit in range(7, -1, -1):
+        selected = (mask >> bit) & 1
+        table |= (((byte >> bit) & 1) << (7 - kept)) * selected
+        kept = kept + selected
+    return table.astype(np.uint8), kept.ravel().astype(np.int64)
+
+
+# Byte compression lookup (COMPRESS[byte, mask]) and set bits per mask byte
+COMPRESS, BYTE_POPCOUNT = _compress_table()
+
+
+def match_mask(alice_bases, bob_bases):
+    """
+    Word-wide basis agreement mask ~(alice XOR bob), padding bits cleared.
+    Parameters:
+    - alice_bases, bob_bases: PackedKey of basis labels (Z=0, X=1)
+    Returns:
+    - mask: uint64 words with a 1 where both parties used the same basis
+    """
+    if alice_bases.nbits != bob_bases.nbits:
+        raise ValueError("Basis strings must have the same length")
+    return ~(alice_bases.words ^ bob_bases.words) & _valid_mask(alice_bases.nbits)
+
+
+def select_bits(key, mask):
+    """
+    Keep the bits of a packed key where mask is set, without unpacking.
+    Each byte is compressed through the COMPRESS lookup and written at its
+    running bit offset; a compressed byte spans at most two output bytes and
+    the pieces never overlap, so summing them is a bitwise OR.
+    Parameters:
+    - key: PackedKey
+    - mask: uint64 words of the same length as key.words (e.g. from match_mask)
+    Returns:
+    - selected: PackedKey of the kept bits, in order
+    """
+    mask_bytes = mask.view(np.uint8)
+    values = COMPRESS[key.buffer, mask_bytes].astype(np.int64)
+    counts = BYTE_POPCOUNT[mask_bytes]
+    ends = np.cumsum(counts)
+    nbits = int(ends[-1]) if len(ends) else 0
+    offset, shift = np.divmod(ends - counts, 8)
+    size = -(-nbits // 64) * 8
+    high = np.bincount(offset, weights=values >> shift, minlength=size + 1)
+    low = np.bincount(offset + 1, weights=(values << (8 - shift)) & 0xFF, minlength=size + 1)
+    buffer = (high + low)[:size].astype(np.uint8)
+    return PackedKey(buffer, nbits)
+
+
+def sift_packed(alice_bases, bob_bases, bob_results):
+    """
+    Sift packed BB84 data: Bob's outcomes are kept where match_mask is set.
+    Parameters:
+    - alice_bases, bob_bases: PackedKey of basis labels (Z=0, X=1)
+    - bob_results: PackedKey of Bob's outcomes
+    Returns:
+    - shared_key: PackedKey of sifted key bits
+    - success_rate: fraction of qubits kept
+    """
+    nbits = bob_results.nbits
+    shared_key = select_bits(bob_results, match_mask(alice_bases, bob_bases))
+    success_rate = shared_key.nbits / nbits if nbits else 0.0
+    return shared_key, success_rate
+
+
+def sifted_error_count(alice_bases, bob_bases, alice_bits, bob_results):
+    """
+    Errors and length of the sifted key, straight from the unsifted packed
+    data: popcount((alice XOR bob) AND mask) and popcount(mask).
+    Returns:
+    - errors: number of sifted positions where the outcomes differ
+    - kept: number of sifted positions
+    """
+    mask = match_mask(alice_bases, bob_bases)
+    return popcount((alice_bits.words ^ bob_results.words) & mask), popcount(mask)
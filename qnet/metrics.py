@@ -0,0 +1,160 @@
+"""
+Entanglement and state metrics on batches of density matrices.
+
+Every kernel takes an array of shape (..., d, d) (or a qutip Qobj, or a list
+of them) and returns one value per state. Spectra come from the Hermitian
+solvers (eigh / eigvalsh), and fidelity with a pure target is the overlap
+⟨ψ|ρ|ψ⟩ rather than a general matrix square root. The values follow the
+qutip conventions: root fidelity, natural-log entropy, negativity
+(‖ρ^T_B‖₁ - 1)/2 and base-2 logarithmic negativity.
+"""
+import numpy as np
+
+# σy ⊗ σy, the spin flip used by the two-qubit concurrence
+SIGMA_YY = np.array([[0, 0, 0, -1],
+                     [0, 0, 1, 0],
+                     [0, 1, 0, 0],
+                     [-1, 0, 0, 0]], dtype=np.complex128)
+
+
+def _as_array(states):
+    # Qobj, list of Qobj or array -> array of shape (..., d, d)
+    if hasattr(states, "full"):
+        return states.full()
+    if isinstance(states, (list, tuple)) and states and hasattr(states[0], "full"):
+        return np.stack([state.full() for state in states])
+    return np.asarray(states)
+
+
+def _eigvalsh(rho):
+    # Spectrum of a (batch of) density matrix, clipped at 0 against round-off
+    return np.clip(np.linalg.eigvalsh(rho), 0, None)
+
+
+def _sqrtm_psd(rho):
+    # Matrix square root of positive semi-definite matrices via eigh
+    values, vectors = np.linalg.eigh(rho)
+    roots = np.sqrt(np.clip(values, 0, None))
+    return (vectors * roots[..., None, :]) @ np.swapaxes(vectors, -1, -2).conj()
+
+
+def fidelity(rho, target, pure=None):
+    """
+    Root fidelity F(ρ, σ) = tr sqrt(sqrt(σ) ρ sqrt(σ)), as qutip.fidelity.
+    Parameters:
+    - rho: density matrices (shape: (..., d, d))
+    - target: pure state ket (shape: (d,), (d, 1) or, with pure=True, (..., d))
+      for the shortcut sqrt(⟨ψ|ρ|ψ⟩), or density matrices (shape: (..., d, d))
+      for the general form
+    - pure: whether target holds kets; inferred from its shape if None
+    Returns:
+    - fidelity: shape (...)
+    """
+    rho = _as_array(rho)
+    target = _as_array(target)
+    if target.ndim >= 2 and target.shape[-1] == 1:
+        target = target[..., 0]  # qutip ket (d, 1)
+    if pure is None:
+        pure = target.ndim == 1
+    if pure:
+        overlap = np.einsum('...i,...ij,...j->...', target.conj(), rho, target)
+        return np.sqrt(np.clip(overlap.real, 0, None))
+    root = _sqrtm_psd(target)
+    return np.sqrt(_eigvalsh(root @ rho @ root)).sum(axis=-1)
+
+
+def purity(rho):
+    # tr(ρ²) = Σ_ij |ρ_ij|² for Hermitian ρ
+    rho = _as_array(rho)
+    return np.einsum('...ij,...ij->...', rho, rho.conj()).real
+
+
+def von_neumann_entropy(rho, base=np.e):
+    # S(ρ) = -Σ λ log λ over the non-zero eigenvalues (qutip.entropy_vn)
+    values = _eigvalsh(_as_array(rho))
+    logs = np.log(np.where(values > 0, values, 1)) / np.log(base)
+    return -(values * logs).sum(axis=-1)
+
+
+def concurrence(rho):
+    """
+    Wootters concurrence of two-qubit states, max(0, λ1 - λ2 - λ3 - λ4) with
+    λ the square roots of the eigenvalues of ρ(σy⊗σy)ρ*(σy⊗σy), taken from the
+    Hermitian matrix sqrt(ρ) ρ̃ sqrt(ρ), which has the same spectrum.
+    """
+    rho = _as_array(rho)
+    root = _sqrtm_psd(rho)
+    flipped = SIGMA_YY @ rho.conj() @ SIGMA_YY
+    lambdas = np.sqrt(_eigvalsh(root @ flipped @ root))[..., ::-1]
+    return np.maximum(0, lambdas[..., 0] - lambdas[..., 1:].sum(axis=-1))
+
+
+def partial_transpose(rho, dims=(2, 2)):
+    # Transpose the second subsystem of bipartite states with subsystem dims (dA, dB)
+    rho = _as_array(rho)
+    d_a, d_b = dims
+    blocks = rho.reshape(rho.shape[:-2] + (d_a, d_b, d_a, d_b))
+    return np.swapaxes(blocks, -3, -1).reshape(rho.shape)
+
+
+def negativity(rho, dims=(2, 2), logarithmic=False):
+    """
+    Negativity (‖ρ^T_B‖₁ - 1)/2 of bipartite states, or log2(2N + 1) if logarithmic.
+    The partial transpose is Hermitian, so its trace norm is Σ|eigvalsh|.
+    """
+    values = np.linalg.eigvalsh(partial_transpose(rho, dims))
+    neg = (np.abs(values).sum(axis=-1) - 1) / 2
+    return np.log2(2 * neg + 1) if logarithmic else neg
+
+
+def random_states(count, dim=4, rng=None):
+    # Random full-rank density matrices G G† / tr(G G†) with complex Ginibre G
+    rng = np.random.default_rng() if rng is None else rng
+    g = rng.normal(size=(count, dim, dim)) + 1j * rng.normal(size=(count, dim, dim))
+    rho = g @ np.swapaxes(g, -1, -2).conj()
+    return rho / np.einsum('kii->k', rho).real[:, None, None]
+
+
+def check_against_qutip(samples=50, seed=0):
+    """
+    Compare every kernel with its qutip equivalent on random two-qubit states.
+    Raises AssertionError on any mismatch.
+    """
+    import qutip
+
+    rng = np.random.default_rng(seed)
+    states = random_states(samples, rng=rng)
+    bell = qutip.bell_state('00')
+    mixed = random_states(1, rng=rng)[0]
+    qobjs = [qutip.Qobj(state, dims=[[2, 2], [2, 2]]) for state in states]
+
+    expected = {
+        "fidelity_pure": [qutip.fidelity(q, bell) for q in qobjs],
+        "fidelity_mixed": [qutip.fidelity(q, qutip.Qobj(mixed, dims=[[2, 2], [2, 2]])) for q in qobjs],
+        "purity": [q.purity() for q in qobjs],
+        "entropy": [qutip.entropy_vn(q) for q in qobjs],
+        "concurrence": [qutip.concurrence(q) for q in qobjs],
+        "negativity": [qutip.negativity(q, 1) for q in qobjs],
+        "log_negativity": [qutip.negativity(q, 1, logarithmic=True) for q in qobjs],
+    }
+    actual = {
+        "fidelity_pure": fidelity(states, bell),
+        "fidelity_mixed": fidelity(states, mixed),
+        "purity": purity(states),
+        "entropy": von_neumann_entropy(states),
+        "concurrence": concurrence(states),
+        "negativity": negativity(states),
+        "log_negativity": negativity(states, logarithmic=True),
+    }
+    for name, values in expected.items():
+        assert np.allclose(actual[name], values, atol=1e-7), name
+
+    # Pure Bell state: maximally entangled, zero entropy
+    bell_dm = qutip.ket2dm(bell).full()
+    assert np.isclose(concurrence(bell_dm), 1) and np.isclose(negativity(bell_dm), 0.5)
+    assert np.isclose(von_neumann_entropy(bell_dm), 0, atol=1e-7) and np.isclose(purity(bell_dm), 1)
+
+
+if __name__ == "__main__":
+    check_against_qutip()
+    print("Metric kernels match qutip")
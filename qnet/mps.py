@@ -0,0 +1,569 @@
+"""
+Matrix-product-state simulation of linear qubit chains.
+
+The a-e line and the repeater chain are one-dimensional, but the qutip path
+stores their 2^n x 2^n density matrix. Here the density matrix itself is an
+MPS: site k holds a tensor of shape (left bond, 4, right bond) whose
+physical index is vec(ρ_k) = (row, column), so mixed states and noise are
+exact. Operations act locally:
+- gates and Kraus channels (qnet.channels) on one site, or on two
+  neighbouring sites followed by an SVD truncated to max_bond (non-adjacent
+  pairs are brought together with SWAP gates and moved back);
+- a projection (Bell-state or parity measurement) followed by tracing the
+  measured sites out of the chain, which is how swaps shorten a repeater chain;
+- reduced states of single sites and pairs, contracted with trace vectors
+  from cached left/right environments.
+The chain stays in mixed canonical form, so truncations are optimal for the
+whole state, and only environments that cover a modified site are rebuilt:
+a sequential repeater chain costs O(1) contractions per swap.
+Memory is O(n · max_bond² · 4), polynomial in the chain length.
+"""
+import numpy as np
+
+# Largest bond dimension kept after a two-site update, and the relative
+# singular-value cutoff below which bonds are dropped
+MAX_BOND = 64
+CUTOFF = 1e-12
+# vec of the 2x2 identity: contracting a site with it traces the site out
+TRACE = np.array([1, 0, 0, 1], dtype=complex)
+BSM_MODES = ("full", "parity")
+
+H = np.array([[1, 1], [1, -1]], dtype=complex) / np.sqrt(2)
+X = np.array([[0, 1], [1, 0]], dtype=complex)
+Z = np.array([[1, 0], [0, -1]], dtype=complex)
+CNOT = np.array([[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 0, 1], [0, 0, 1, 0]], dtype=complex)
+SWAP = np.array([[1, 0, 0, 0], [0, 0, 1, 0], [0, 1, 0, 0], [0, 0, 0, 1]], dtype=complex)
+# Bell states in the qnet.belldiagonal order Φ⁺, Ψ⁺, Φ⁻, Ψ⁻ (index x + 2z)
+BELL_STATES = np.array([[1, 0, 0, 1], [0, 1, 1, 0], [1, 0, 0, -1], [0, 1, -1, 0]], dtype=complex) / np.sqrt(2)
+# Projector onto span{|00⟩, |11⟩}, the swap of qnet.repeater.entanglement_swapping
+PARITY = np.diag([1, 0, 0, 1]).astype(complex)
+
+
+def _superop(kraus_ops):
+    """
+    Superoperator Σ_k K_k ⊗ K_k* of one or two sites in the MPS site ordering.
+    For two sites the vec index is ((row1, col1), (row2, col2)).
+    """
+    kraus_ops = np.asarray(kraus_ops, dtype=complex)
+    if kraus_ops.ndim == 2:
+        kraus_ops = kraus_ops[None]
+    dim = kraus_ops.shape[-1]
+    if dim == 2:
+        return np.einsum('kac,kbd->abcd', kraus_ops, kraus_ops.conj()).reshape(4, 4)
+    k = kraus_ops.reshape(-1, 2, 2, 2, 2)  # [k, a1, a2, c1, c2]
+    sup = np.einsum('kxyuv,kabcd->xaybucvd', k, k.conj())
+    return sup.reshape(16, 16)
+
+
+def _trace_preserving(sup):
+    # Tr(S ρ) = Tr(ρ) for every ρ: the site's trace transfer, and so every
+    # cached environment, is unchanged
+    return np.allclose(TRACE @ sup, TRACE)
+
+
+class MPS:
+    """
+    Density matrix of a qubit chain as a matrix product state.
+    The chain is kept in mixed canonical form around an orthogonality centre
+    (sites to its left are left-orthonormal, sites to its right
+    right-orthonormal), so the singular values of a two-site update are those
+    of the whole state and truncating them is optimal in the Frobenius norm.
+    Single-site operations are queued as per-site superoperators and applied
+    when the site is next contracted or passed by the centre; queued unitaries
+    leave the truncation optimal, queued noise acts on top of it. Trace
+    environments are cached and only the ones covering a modified site are
+    rebuilt.
+    Parameters:
+    - num_sites: number of qubits, all starting in |0⟩
+    - max_bond: largest bond dimension kept after two-site updates
+    - cutoff: relative singular-value cutoff of the truncation
+    """
+
+    def __init__(self, num_sites, max_bond=MAX_BOND, cutoff=CUTOFF):
+        zero = np.zeros((1, 4, 1), dtype=complex)
+        zero[0, 0, 0] = 1.0  # vec(|0⟩⟨0|)
+        self.tensors = [zero.copy() for _ in range(num_sites)]
+        # Queued single-site superoperators (shape: (num_sites, 4, 4))
+        self.pending = np.tile(np.eye(4, dtype=complex), (num_sites, 1, 1))
+        self.center = 0
+        # _left[k]: trace of sites < k; _right[m]: trace of the last m sites
+        self._left = [np.ones(1, dtype=complex)]
+        self._right = [np.ones(1, dtype=complex)]
+        self.max_bond = max_bond
+        self.cutoff = cutoff
+        # Discarded weight Σ s² / Σ s² summed over all truncations
+        self.truncation_error = 0.0
+        # Number of site transfer matrices contracted into environments
+        self.environment_updates = 0
+
+    def __len__(self):
+        return len(self.tensors)
+
+    def __repr__(self):
+        return f"MPS(sites={len(self)}, largest bond={max(self.bond_dims(), default=1)}, {self.nbytes()} bytes)"
+
+    def bond_dims(self):
+        return [t.shape[2] for t in self.tensors[:-1]]
+
+    def nbytes(self):
+        return sum(t.nbytes for t in self.tensors) + self.pending.nbytes
+
+    def _touch(self, site):
+        # Drop the cached environments that cover `site`
+        del self._left[site + 1:]
+        del self._right[len(self) - site:]
+
+    def _transfer(self, site):
+        # Site traced out, queued operations included (shape: (left bond, right bond))
+        self.environment_updates += 1
+        return np.einsum('lpr,p->lr', self.tensors[site], TRACE @ self.pending[site])
+
+    def _left_env(self, site):
+        # Trace of the sites < site (shape: (bond,))
+        while len(self._left) <= site:
+            self._left.append(self._left[-1] @ self._transfer(len(self._left) - 1))
+        return self._left[site]
+
+    def _right_env(self, site):
+        # Trace of the sites > site (shape: (bond,))
+        m = len(self) - 1 - site
+        while len(self._right) <= m:
+            self._right.append(self._transfer(len(self) - len(self._right)) @ self._right[-1])
+        return self._right[m]
+
+    def _flush(self, site):
+        # Apply the queued operations of the centre site to its tensor
+        self.tensors[site] = np.einsum('pq,lqr->lpr', self.pending[site], self.tensors[site])
+        self.pending[site] = np.eye(4)
+
+    def _move_center(self, site):
+        # Shift the orthogonality centre with QR decompositions, flushing the
+        # queued operations of every site it passes
+        while self.center < site:
+            k = self.center
+            self._flush(k)
+            chi_l, _, chi_r = self.tensors[k].shape
+            q, r = np.linalg.qr(self.tensors[k].reshape(chi_l * 4, chi_r))
+            self.tensors[k] = q.reshape(chi_l, 4, -1)
+            self.tensors[k + 1] = np.einsum('ab,bpr->apr', r, self.tensors[k + 1])
+            self._touch(k)
+            self._touch(k + 1)
+            self.center += 1
+        while self.center > site:
+            k = self.center
+            self._flush(k)
+            chi_l, _, chi_r = self.tensors[k].shape
+            q, r = np.linalg.qr(self.tensors[k].reshape(chi_l, 4 * chi_r).T)
+            self.tensors[k] = q.T.reshape(-1, 4, chi_r)
+            self.tensors[k - 1] = np.einsum('lpa,ba->lpb', self.tensors[k - 1], r)
+            self._touch(k)
+            self._touch(k - 1)
+            self.center -= 1
+
+    def _apply_one(self, sup, site):
+        self.pending[site] = sup @ self.pending[site]
+        if not _trace_preserving(sup):
+            self._touch(site)
+
+    def _apply_two(self, sup, site, center_right=True):
+        # sup acts on sites (site, site + 1); contract at the centre, update and
+        # split with a truncated SVD, leaving the centre on the right (or left) site
+        self._move_center(site if self.center <= site else site + 1)
+        theta = np.einsum('lpm,mqr->lpqr', self.tensors[site], self.tensors[site + 1])
+        ops = np.einsum('PQpq,pa,qb->PQab', sup.reshape(4, 4, 4, 4), self.pending[site], self.pending[site + 1])
+        theta = np.einsum('PQpq,lpqr->lPQr', ops, theta)
+        self.pending[site] = self.pending[site + 1] = np.eye(4)
+        chi_l, chi_r = theta.shape[0], theta.shape[3]
+        u, s, vh = np.linalg.svd(theta.reshape(chi_l * 4, 4 * chi_r), full_matrices=False)
+        total = np.sum(s ** 2)
+        keep = max(1, min(self.max_bond, int(np.sum(s > self.cutoff * s[0])) if s[0] > 0 else 1))
+        if total > 0:
+            self.truncation_error += np.sum(s[keep:] ** 2) / total
+        u, s, vh = u[:, :keep], s[:keep], vh[:keep]
+        if center_right:
+            self.tensors[site] = u.reshape(chi_l, 4, keep)
+            self.tensors[site + 1] = (s[:, None] * vh).reshape(keep, 4, chi_r)
+            self.center = site + 1
+        else:
+            self.tensors[site] = (u * s).reshape(chi_l, 4, keep)
+            self.tensors[site + 1] = vh.reshape(keep, 4, chi_r)
+            self.center = site
+        self._touch(site)
+        self._touch(site + 1)
+
+    def _two_site(self, sup, a, b):
+        # Two-site superoperator on (a, b): bring b next to a with SWAPs, apply, move back
+        if a == b:
+            raise ValueError("A two-site operation needs two different sites")
+        if b < a:
+            # Relabel so the operator acts on (b, a) in chain order
+            sup = sup.reshape(4, 4, 4, 4).transpose(1, 0, 3, 2).reshape(16, 16)
+            a, b = b, a
+        swap = _superop(SWAP)
+        for k in range(b - 1, a, -1):
+            self._apply_two(swap, k, center_right=False)
+        self._apply_two(sup, a)
+        for k in range(a + 1, b):
+            self._apply_two(swap, k)
+
+    def apply_gate(self, gate, sites):
+        """
+        Unitary gate (2x2 or 4x4 array or Qobj) on one site or a pair of sites.
+        """
+        gate = gate.full() if hasattr(gate, "full") else gate
+        self.apply_channel([gate], sites)
+
+    def apply_channel(self, kraus_ops, sites):
+        """
+        Channel with Kraus operators of shape (k, 2, 2) on a site (int), or of
+        shape (k, 4, 4) on a pair of sites.
+        """
+        sites = (sites,) if np.ndim(sites) == 0 else tuple(sites)
+        sup = _superop(kraus_ops)
+        if len(sites) == 1:
+            self._apply_one(sup, sites[0])
+        else:
+            self._two_site(sup, *sites)
+
+    def apply_noise(self, channel, p, sites=None):
+        """
+        Named single-qubit channel (see qnet.channels.CHANNELS) on every listed site.
+        """
+        from qnet.channels import kraus
+
+        sup = _superop(kraus(channel, p))
+        if sites is None:
+            # One batched product queues the channel on every site
+            self.pending = sup @ self.pending
+            if not _trace_preserving(sup):
+                self._left, self._right = self._left[:1], self._right[:1]
+            return
+        for site in sites:
+            self._apply_one(sup, site)
+
+    def create_bell_pair(self, site):
+        """
+        |Φ⁺⟩ on the neighbouring sites (site, site + 1), which must hold |0⟩|0⟩.
+        """
+        self.apply_gate(H, site)
+        self.apply_gate(CNOT, (site, site + 1))
+
+    def trace_out(self, site):
+        # Move the centre to the site, contract it with the trace vector and
+        # absorb it into a neighbour, which becomes the new centre
+        self._move_center(site)
+        self._touch(site)
+        if len(self) > 1:
+            self._touch(site - 1 if site > 0 else site + 1)
+        matrix = np.einsum('lpr,p->lr', self.tensors.pop(site), TRACE @ self.pending[site])
+        self.pending = np.delete(self.pending, site, axis=0)
+        if not self.tensors:
+            return
+        if site > 0:
+            self.tensors[site - 1] = np.einsum('lpm,mr->lpr', self.tensors[site - 1], matrix)
+            self.center = site - 1
+        else:
+            self.tensors[0] = np.einsum('lm,mpr->lpr', matrix, self.tensors[0])
+            self.center = 0
+
+    def project(self, projector, site, rho=None):
+        """
+        Apply a projector (4x4) on sites (site, site + 1), trace both sites out
+        of the chain and renormalize to unit trace.
+        Parameters:
+        - rho: reduced state of the two sites, if already computed
+        Returns:
+        - probability: probability of the projected outcome
+        """
+        rho = self.reduced_state(site, site + 1) if rho is None else rho
+        probability = float(np.real(np.trace(projector @ rho @ projector)))
+        if probability <= 0:
+            raise ValueError("Projection onto a zero-probability outcome")
+        self._apply_two(_superop([projector]), site)
+        self.trace_out(site + 1)
+        self.trace_out(site)
+        if self.tensors:
+            # Divide by the trace that is actually left: truncation may have
+            # moved it away from the outcome probability
+            self.tensors[self.center] = self.tensors[self.center] / self.trace()
+            self._touch(self.center)
+        return probability
+
+    def bell_measure(self, site, outcome=None, rng=None):
+        """
+        Bell-state measurement of sites (site, site + 1); both are removed.
+        Parameters:
+        - outcome: Bell index to post-select (None = sample from the Born rule)
+        - rng: numpy Generator used for sampling
+        Returns:
+        - outcome: measured Bell index x + 2z (Φ⁺, Ψ⁺, Φ⁻, Ψ⁻)
+        - probability: probability of that outcome
+        """
+        rho = self.reduced_state(site, site + 1)
+        probs = np.clip(np.real(np.einsum('ki,ij,kj->k', BELL_STATES.conj(), rho, BELL_STATES)), 0, None)
+        if outcome is None:
+            rng = np.random.default_rng() if rng is None else rng
+            outcome = int(rng.choice(4, p=probs / probs.sum()))
+        projector = np.outer(BELL_STATES[outcome], BELL_STATES[outcome].conj())
+        return outcome, self.project(projector, site, rho)
+
+    def entanglement_swap(self, site, bsm="full", rng=None):
+        """
+        Swap at the repeater node holding sites (site, site + 1): measure them
+        and, for a full Bell-state measurement, apply the Pauli correction
+        X^x Z^z to the qubit right of the node.
+        Returns:
+        - outcome: Bell index (None for the parity projection)
+        """
+        if bsm not in BSM_MODES:
+            raise ValueError(f"bsm must be one of {BSM_MODES}, got {bsm!r}")
+        if bsm == "parity":
+            self.project(PARITY, site)
+            return None
+        outcome, _ = self.bell_measure(site, rng=rng)
+        x, z = outcome & 1, outcome >> 1
+        # After removing the two measured sites, the right partner sits at `site`
+        if x:
+            self.apply_gate(X, site)
+        if z:
+            self.apply_gate(Z, site)
+        return outcome
+
+    def trace(self):
+        site = self.center
+        return complex(self._left_env(site) @ self._transfer(site) @ self._right_env(site)).real
+
+    def reduced_state(self, i, j=None):
+        """
+        Density matrix of site i (2x2) or of sites i and j (4x4, site i as the
+        first tensor factor), normalized to unit trace.
+        """
+        if j is None:
+            vec = np.einsum('l,lpr,r->p', self._left_env(i), self.tensors[i], self._right_env(i))
+            rho = (self.pending[i] @ vec).reshape(2, 2)
+            return rho / np.trace(rho)
+        return self.pair_states([(i, j)])[0]
+
+    def pair_states(self, pairs):
+        """
+        Two-site reduced density matrices of many pairs, sharing the cached
+        environments and sweeping right from each left site.
+        Returns:
+        - rho: array of shape (len(pairs), 4, 4)
+        """
+        pairs = [(int(i), int(j)) for i, j in pairs]
+        out = np.empty((len(pairs), 4, 4), dtype=complex)
+        by_left = {}
+        for index, (i, j) in enumerate(pairs):
+            if i == j:
+                raise ValueError("A pair needs two different sites")
+            by_left.setdefault(min(i, j), []).append(index)
+        for a, members in by_left.items():
+            members.sort(key=lambda index: max(pairs[index]))
+            # open[p, r]: sites < a traced, site a open, sites between traced
+            open_left = self.pending[a] @ np.einsum('l,lpr->pr', self._left_env(a), self.tensors[a])
+            position = a + 1
+            for index in members:
+                i, j = pairs[index]
+                b = max(i, j)
+                while position < b:
+                    open_left = open_left @ self._transfer(position)
+                    position += 1
+                vec = np.einsum('pl,lqr,r->pq', open_left, self.tensors[b], self._right_env(b)) @ self.pending[b].T
+                # vec[(ra, ca), (rb, cb)] -> ρ[(ra, rb), (ca, cb)]
+                rho = vec.reshape(2, 2, 2, 2).transpose(0, 2, 1, 3).reshape(4, 4)
+                if i > j:
+                    rho = rho.reshape(2, 2, 2, 2).transpose(1, 0, 3, 2).reshape(4, 4)
+                out[index] = rho / np.trace(rho)
+        return out
+
+    def to_dense(self):
+        """
+        Full density matrix (2^n x 2^n); for validation on small chains.
+        """
+        n = len(self)
+        tensors = [np.einsum('pq,lqr->lpr', op, t) for op, t in zip(self.pending, self.tensors)]
+        vec = tensors[0]
+        for t in tensors[1:]:
+            vec = np.einsum('l...m,mpr->l...pr', vec, t)
+        vec = vec.reshape((2, 2) * n)
+        rho = vec.transpose(list(range(0, 2 * n, 2)) + list(range(1, 2 * n, 2)))
+        return rho.reshape(2 ** n, 2 ** n)
+
+
+def repeater_chain(segments, link_noise=0.0, bsm="parity", memory_channel=None, memory_noise=0.0,
+                   max_bond=MAX_BOND, seed=None):
+    """
+    Sequential repeater chain on an MPS of 2 · segments qubits.
+    Link k is |Φ⁺⟩ on sites (2k, 2k + 1) with two-qubit depolarizing noise
+    ρ -> (1-p)ρ + p I/4; the node between links swaps by measuring its two
+    qubits, left to right. After every swap the waiting qubits can go
+    through a local memory channel.
+    Parameters:
+    - segments: number of elementary links
+    - link_noise: depolarizing probability per link
+    - bsm: "parity" (the projection of qnet.repeater.entanglement_swapping)
+      or "full" (sampled Bell measurement with Pauli correction)
+    - memory_channel, memory_noise: qnet.channels channel applied to every
+      remaining qubit after each swap (None = no memory noise)
+    - max_bond: bond dimension cap
+    - seed: seed of the Bell-measurement outcomes
+    Returns:
+    - state: MPS of the two end qubits
+    - fidelity: fidelity (sqrt(⟨Φ⁺|ρ|Φ⁺⟩), the qutip convention) of the end-to-end pair
+    """
+    rng = np.random.default_rng(seed)
+    mps = MPS(2 * segments, max_bond=max_bond)
+    paulis = np.stack([np.kron(a, b) for a in (np.eye(2), X, 1j * X @ Z, Z) for b in (np.eye(2), X, 1j * X @ Z, Z)])
+    depolarizing = np.concatenate([[np.sqrt(1 - 15 * link_noise / 16) * paulis[0]],
+                                   np.sqrt(link_noise / 16) * paulis[1:]])
+    for k in range(segments):
+        mps.create_bell_pair(2 * k)
+        if link_noise:
+            mps.apply_channel(depolarizing, (2 * k, 2 * k + 1))
+    for _ in range(segments - 1):
+        # Sites: [end A, right qubit of the joined link, next link, ...]
+        mps.entanglement_swap(1, bsm, rng)
+        if memory_channel is not None:
+            mps.apply_noise(memory_channel, memory_noise)
+    rho = mps.reduced_state(0, 1)
+    fidelity = np.sqrt(max(np.real(BELL_STATES[0].conj() @ rho @ BELL_STATES[0]), 0.0))
+    return mps, fidelity
+
+
+def ae_network(num_nodes=5, noise_prob=0.0, channel="depolarizing", max_bond=MAX_BOND):
+    """
+    The qnet.ae line network as an MPS: 2(num_nodes - 1) qubits, link i as
+    |+⟩|0⟩ on sites (2i, 2i + 1), with local noise on every qubit.
+    """
+    mps = MPS(2 * (num_nodes - 1), max_bond=max_bond)
+    for i in range(num_nodes - 1):
+        mps.apply_gate(H, 2 * i)
+    if noise_prob:
+        mps.apply_noise(channel, noise_prob)
+    return mps
+
+
+def check_against_qutip(seed=0):
+    """
+    Compare the MPS with dense density matrices (qnet.channels / qnet.marginals)
+    and the qutip repeater and a-e paths on small chains. Raises
+    AssertionError on any mismatch.
+    """
+    from qutip import Qobj
+
+    from qnet import ae, repeater
+    from qnet.channels import apply_channel, kraus
+    from qnet.marginals import reduced_states
+
+    rng = np.random.default_rng(seed)
+
+    def random_unitary(dim):
+        q, r = np.linalg.qr(rng.normal(size=(dim, dim)) + 1j * rng.normal(size=(dim, dim)))
+        return q * (np.diag(r) / abs(np.diag(r)))
+
+    def embed(op, sites, n):
+        # Dense operator of a one- or two-site op on sites of an n-qubit register
+        if len(sites) == 1:
+            return np.kron(np.kron(np.eye(2 ** sites[0]), op), np.eye(2 ** (n - sites[0] - 1)))
+        a, b = sites
+        full = np.zeros((2 ** n, 2 ** n), dtype=complex)
+        t = op.reshape(2, 2, 2, 2)
+        for index in range(2 ** n):
+            bits = [(index >> (n - 1 - q)) & 1 for q in range(n)]
+            for out_a in range(2):
+                for out_b in range(2):
+                    new = list(bits)
+                    new[a], new[b] = out_a, out_b
+                    target = sum(bit << (n - 1 - q) for q, bit in enumerate(new))
+                    full[target, index] += t[out_a, out_b, bits[a], bits[b]]
+        return full
+
+    # Random gates and channels on five qubits, against the dense density matrix
+    n = 5
+    mps = MPS(n)
+    rho = np.zeros((2 ** n, 2 ** n), dtype=complex)
+    rho[0, 0] = 1
+    for _ in range(25):
+        if rng.random() < 0.5:
+            a, b = (int(q) for q in rng.choice(n, 2, replace=False))
+            u = random_unitary(4)
+            mps.apply_gate(u, (a, b))
+            full = embed(u, (a, b), n)
+            rho = full @ rho @ full.conj().T
+        else:
+            site = int(rng.integers(n))
+            channel = ("depolarizing", "dephasing", "amplitude_damping")[rng.integers(3)]
+            p = rng.random() * 0.3
+            mps.apply_noise(channel, p, [site])
+            rho = apply_channel(rho, kraus(channel, p), [site])
+    assert np.allclose(mps.to_dense(), rho)
+    pairs = [(i, j) for i in range(n) for j in range(n) if i != j]
+    assert np.allclose(mps.pair_states(pairs), reduced_states(rho, pairs))
+    assert np.allclose(mps.reduced_state(2), reduced_states(rho, [(2,)])[0])
+
+    # Mixed canonical form around the centre
+    for k, t in enumerate(mps.tensors):
+        if k < mps.center:
+            m = t.reshape(-1, t.shape[2])
+            assert np.allclose(m.conj().T @ m, np.eye(m.shape[1])), k
+        elif k > mps.center:
+            m = t.reshape(t.shape[0], -1)
+            assert np.allclose(m @ m.conj().T, np.eye(m.shape[0])), k
+
+    # In canonical form the discarded weight is the actual relative error of ρ
+    # (unitaries only: queued non-unitary channels act outside the canonical gauge)
+    mps = MPS(n)
+    for _ in range(12):
+        a, b = (int(q) for q in rng.choice(n, 2, replace=False))
+        mps.apply_gate(random_unitary(4), (a, b))
+        mps.apply_gate(random_unitary(2), int(rng.integers(n)))
+    rho = mps.to_dense()
+    mps.max_bond, mps.truncation_error = 2, 0.0
+    u = random_unitary(4)
+    mps.apply_gate(u, (2, 3))
+    full = embed(u, (2, 3), n)
+    rho = full @ rho @ full.conj().T
+    error = np.linalg.norm(mps.to_dense() - rho) ** 2 / np.linalg.norm(rho) ** 2
+    assert mps.truncation_error > 1e-3 and np.isclose(mps.truncation_error, error)
+
+    # Parity swaps on noisy links: the qutip swap of qnet.repeater, step by step
+    noise = 0.1
+    link = repeater.apply_depolarizing_noise(repeater.create_bell_state(), noise)
+    expected = link
+    for segments in range(2, 5):
+        expected = repeater.entanglement_swapping(expected, link)
+        mps, fid = repeater_chain(segments, noise, bsm="parity")
+        assert np.allclose(mps.reduced_state(0, 1), expected.full()), segments
+        assert np.isclose(fid, repeater.repeater_chain(segments, noise)[1])
+
+    # Full Bell measurements with corrections: Werner parameters multiply
+    for segments in (2, 3, 6):
+        _, fid = repeater_chain(segments, noise, bsm="full", seed=seed)
+        assert np.isclose(fid, np.sqrt((1 + 3 * (1 - noise) ** segments) / 4))
+
+    # a-e network with local noise against the qutip state and qnet.ae.apply_noise
+    for channel in ("depolarizing", "amplitude_damping"):
+        dense = ae.apply_noise(ae.build_network(4), 0.1, channel)
+        mps = ae_network(4, 0.1, channel)
+        hops = [(i, i + 1) for i in range(3)]
+        assert np.allclose(mps.pair_states(hops), reduced_states(dense, hops))
+        assert np.allclose(mps.reduced_state(3), dense.ptrace(3).full())
+    assert isinstance(Qobj(mps.reduced_state(0, 1), dims=[[2, 2], [2, 2]]), Qobj)
+
+    # Hundreds of segments (600 qubits) with memory noise; the trace stays 1
+    mps, fid = repeater_chain(300, 0.01, bsm="full", memory_channel="dephasing", memory_noise=1e-3, seed=seed)
+    assert len(mps) == 2 and 0.5 < fid < 1 and np.isclose(mps.trace(), 1.0)
+    # Cached environments: a constant number of transfers per swap
+    half, _ = repeater_chain(150, 0.01, bsm="full", memory_channel="dephasing", memory_noise=1e-3, seed=seed)
+    assert mps.environment_updates < 2.1 * half.environment_updates
+    # Swaps renormalize by the trace left after truncation
+    mps, _ = repeater_chain(8, 0.1, bsm="parity", max_bond=2)
+    assert mps.truncation_error > 0 and np.isclose(mps.trace(), 1.0)
+    mps = ae_network(300, 0.05)
+    assert max(mps.bond_dims()) == 1 and mps.pair_states([(0, 1), (10, 11)]).shape == (2, 4, 4)
+
+
+if __name__ == "__main__":
+    check_against_qutip()
+    print("MPS chains match the dense and qutip paths")
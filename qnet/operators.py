@@ -0,0 +1,205 @@
+"""
+Shared cache of constant qutip operators (projectors, identities, Pauli
+matrices, basis kets and Bell states), keyed by operator kind and dims.
+
+The hot loops of the repeater, a-e and E91 simulations used to rebuild
+these objects on every call. Cached operators are shared between callers,
+so treat them as read-only: qutip arithmetic returns new objects, but
+assigning to attributes such as .dims would change the cached copy.
+"""
+import threading
+from collections import OrderedDict
+
+# Maximum number of cached operators before the least recently used is evicted
+MAXSIZE = 128
+
+
+def _freeze(dims):
+    # Hashable form of an int, a dims list or a nested qutip dims list
+    if isinstance(dims, (list, tuple)):
+        return tuple(_freeze(d) for d in dims)
+    return int(dims)
+
+
+def _identity(dims):
+    from qutip import qeye
+    return qeye(list(dims)) if isinstance(dims, tuple) else qeye(dims)
+
+
+def _basis(dims, index):
+    from qutip import basis
+    return basis(dims, index)
+
+
+def _sigmax(dims):
+    from qutip import sigmax
+    return sigmax()
+
+
+def _sigmaz(dims):
+    from qutip import sigmaz
+    return sigmaz()
+
+
+def _bell_state(dims):
+    # |Φ⁺⟩ = (|00⟩ + |11⟩)/√2
+    from qutip import tensor
+    zero, one = operator("basis", 2, 0), operator("basis", 2, 1)
+    return (tensor(zero, zero) + tensor(one, one)).unit()
+
+
+def _bell_dm(dims):
+    from qutip import ket2dm
+    return ket2dm(operator("bell_state", dims))
+
+
+def _parity_projector(dims):
+    # |00⟩⟨00| + |11⟩⟨11|, the middle-qubit measurement of entanglement_swapping
+    from qutip import tensor
+    zero, one = operator("basis", 2, 0), operator("basis", 2, 1)
+    return tensor(zero, zero).proj() + tensor(one, one).proj()
+
+
+def _swap_projection(dims):
+    # Parity projector on qubits 1 and 2 of a four-qubit register
+    from qutip import tensor
+    return tensor(operator("identity", 2), operator("parity_projector", (2, 2)), operator("identity", 2))
+
+
+# kind -> builder(dims, *params)
+BUILDERS = {
+    "identity": _identity,
+    "basis": _basis,
+    "sigmax": _sigmax,
+    "sigmaz": _sigmaz,
+    "bell_state": _bell_state,
+    "bell_dm": _bell_dm,
+    "parity_projector": _parity_projector,
+    "swap_projection": _swap_projection,
+}
+
+
+# Kinds with a fixed shape: the dims argument must match (it is part of the key)
+FIXED_DIMS = {
+    "sigmax": 2,
+    "sigmaz": 2,
+    "bell_state": (2, 2),
+    "bell_dm": (2, 2),
+    "parity_projector": (2, 2),
+    "swap_projection": (2, 2, 2, 2),
+}
+
+
+class OperatorCache:
+    """
+    Bounded LRU cache of operators keyed by (kind, dims, params).
+    Parameters:
+    - maxsize: number of operators kept before the least recently used is evicted
+    """
+
+    def __init__(self, maxsize=MAXSIZE):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, kind, dims, *params):
+        if kind not in BUILDERS:
+            raise KeyError(f"Unknown operator kind {kind!r}")
+        dims = _freeze(dims)
+        if kind in FIXED_DIMS and dims != FIXED_DIMS[kind]:
+            raise ValueError(f"{kind} is only defined for dims {FIXED_DIMS[kind]}, got {dims}")
+        key = (kind, dims, params)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+        # Build outside the lock: builders may fetch other operators from the cache
+        op = BUILDERS[kind](dims, *params)
+        with self._lock:
+            self._entries[key] = op
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return op
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+# Process-wide cache used by the protocol modules
+CACHE = OperatorCache()
+
+
+def operator(kind, dims=2, *params):
+    """
+    Cached operator of the given kind, e.g. operator("basis", 2, 1),
+    operator("identity", (2, 2)) or operator("swap_projection", (2, 2, 2, 2)).
+    """
+    return CACHE.get(kind, dims, *params)
+
+
+def cache_stats():
+    return CACHE.stats()
+
+
+def check_cache():
+    """
+    Compare cached operators with freshly built ones and exercise eviction.
+    Raises AssertionError on any mismatch.
+    """
+    from qutip import basis, qeye, sigmax, sigmaz, tensor
+
+    fresh = {
+        ("identity", 2): qeye(2),
+        ("identity", (2, 2)): qeye([2, 2]),
+        ("sigmax", 2): sigmax(),
+        ("sigmaz", 2): sigmaz(),
+        ("bell_state", (2, 2)): (tensor(basis(2, 0), basis(2, 0)) + tensor(basis(2, 1), basis(2, 1))).unit(),
+        ("parity_projector", (2, 2)): (tensor(basis(2, 0), basis(2, 0)).proj() +
+                                       tensor(basis(2, 1), basis(2, 1)).proj()),
+    }
+    for (kind, dims), expected in fresh.items():
+        cached = operator(kind, dims)
+        assert cached is operator(kind, dims)
+        assert cached.dims == expected.dims and (cached - expected).norm() < 1e-12, kind
+    assert operator("swap_projection", (2, 2, 2, 2)).dims == [[2] * 4, [2] * 4]
+
+    # Fixed-shape kinds reject other dims instead of caching a wrong-sized operator
+    for kind, dims in (("sigmax", [[4], [4]]), ("bell_state", (2, 3)), ("swap_projection", (2, 2))):
+        try:
+            operator(kind, dims)
+        except ValueError:
+            continue
+        raise AssertionError(f"{kind} accepted dims {dims}")
+
+    small = OperatorCache(maxsize=2)
+    for index in range(3):
+        small.get("basis", 4, index)
+    small.get("basis", 4, 2)
+    stats = small.stats()
+    assert stats["size"] == 2 and stats["evictions"] == 1 and stats["hits"] == 1
+
+
+if __name__ == "__main__":
+    check_cache()
+    print("Cached operators match freshly built ones:", cache_stats())
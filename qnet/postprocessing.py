@@ -0,0 +1,176 @@
+import time
+
+import numpy as np
+
+# Number of Cascade passes; the block size doubles on every pass
+CASCADE_PASSES = 4
+
+
+def binary_entropy(p):
+    if p <= 0 or p >= 1:
+        return 0.0
+    return float(-p * np.log2(p) - (1 - p) * np.log2(1 - p))
+
+
+def _locate_errors(diff, perm, lo, hi):
+    """
+    Cascade BINARY step run on all mismatched blocks [lo, hi) of one pass at once.
+    The blocks are gathered into one padded 2D array and halved in lockstep,
+    so the cost is proportional to the mismatched blocks, not the whole key.
+    Parameters:
+    - diff: uint8 array alice ^ bob (parity comparisons only ever see its parity)
+    - perm: permutation of the pass
+    - lo, hi: block bounds in permuted order
+    Returns:
+    - positions: index into the key of one differing bit per block
+    - leaked: number of parities disclosed
+    """
+    width = int((hi - lo).max())
+    offsets = np.arange(width)
+    index = lo[:, None] + offsets
+    valid = index < hi[:, None]
+    segment = diff[perm[np.where(valid, index, 0)]] & valid
+    # cum[:, i] is the parity of the first i bits of each block
+    cum = np.zeros((len(lo), width + 1), dtype=np.uint8)
+    np.bitwise_xor.accumulate(segment, axis=1, out=cum[:, 1:])
+
+    rows = np.arange(len(lo))
+    left = np.zeros(len(lo), dtype=np.int64)
+    right = hi - lo
+    leaked = 0
+    while True:
+        active = right - left > 1
+        if not active.any():
+            return perm[lo + left], leaked
+        mid = (left + right) // 2
+        left_differs = (cum[rows, mid] ^ cum[rows, left]).astype(bool)
+        leaked += int(active.sum())
+        right = np.where(active & left_differs, mid, right)
+        left = np.where(active & ~left_differs, mid, left)
+
+
+def cascade(alice_key, bob_key, qber, passes=CASCADE_PASSES, rng=None):
+    """
+    Cascade reconciliation with vectorized parity blocks.
+    Each pass shuffles the key with a public permutation, compares the parity
+    of every block in one array operation and binary-searches all mismatched
+    blocks in parallel. Every corrected bit toggles the parity of the block
+    holding it in each earlier pass, and those blocks are searched again
+    until all block parities agree (the cascade effect).
+    Parameters:
+    - alice_key, bob_key: uint8 arrays of sifted bits (same length)
+    - qber: estimated quantum bit error rate, sets the first block size 0.73 / qber
+    - passes: number of passes
+    - rng: numpy Generator for the public permutations
+    Returns:
+    - corrected: Bob's key after reconciliation
+    - leaked: number of parity bits disclosed on the public channel
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    n = len(alice_key)
+    corrected = np.array(bob_key, dtype=np.uint8)
+    if n == 0:
+        return corrected, 0
+    block = n if qber <= 0 else max(2, int(np.ceil(0.73 / qber)))
+    diff = alice_key ^ corrected
+
+    leaked = 0
+    done_passes = []
+    for i in range(passes):
+        perm = np.arange(n) if i == 0 else rng.permutation(n)
+        inverse = np.empty(n, dtype=np.int64)
+        inverse[perm] = np.arange(n)
+        size = min(block << i, n)
+        starts = np.arange(0, n, size)
+        # Alice announces every block parity once; Bob compares with his own
+        mismatch = (np.add.reduceat(diff[perm], starts) & 1).astype(bool)
+        leaked += len(starts)
+        done_passes.append((perm, inverse, size, mismatch))
+
+        # Correct until every block of every pass so far has matching parity
+        while True:
+            fixed = False
+            for perm_q, _, size_q, mismatch_q in done_passes:
+                bad = np.flatnonzero(mismatch_q)
+                if len(bad) == 0:
+                    continue
+                lo = bad * size_q
+                hi = np.minimum(lo + size_q, n)
+                positions, leak = _locate_errors(diff, perm_q, lo, hi)
+                leaked += leak
+                diff[positions] ^= 1
+                corrected[positions] ^= 1
+                # Each flip toggles the parity of its block in every pass
+                for _, inverse_r, size_r, mismatch_r in done_passes:
+                    toggles = np.bincount(inverse_r[positions] // size_r, minlength=len(mismatch_r))
+                    mismatch_r ^= (toggles & 1).astype(bool)
+                fixed = True
+            if not fixed:
+                break
+    return corrected, leaked
+
+
+def toeplitz_hash(bits, out_len, seed_bits):
+    """
+    Multiply bits by a binary Toeplitz matrix, mod 2, in O(n log n).
+    T[i, j] = seed_bits[i - j + n - 1], so T @ x is a slice of the linear
+    convolution of seed_bits and x. A cyclic convolution of length
+    n + out_len - 1 already gives that slice without wrap-around, so the
+    FFTs never need the full 2n + out_len size.
+    Parameters:
+    - bits: uint8 array of n key bits, or a 2D array with one key per row
+      (rows share the FFT of the seed)
+    - out_len: number of output bits
+    - seed_bits: uint8 array of n + out_len - 1 public random bits
+    Returns:
+    - hashed: uint8 array of out_len bits (one row per key for 2D input)
+    """
+    from scipy import fft
+
+    n = bits.shape[-1]
+    if out_len <= 0 or n == 0:
+        return np.zeros(bits.shape[:-1] + (0,), dtype=np.uint8)
+    size = fft.next_fast_len(n + out_len - 1, real=True)
+    spectrum = fft.rfft(bits.astype(np.float64), size, axis=-1)
+    spectrum *= fft.rfft(seed_bits.astype(np.float64), size)
+    conv = fft.irfft(spectrum, size, axis=-1)[..., n - 1:n - 1 + out_len]
+    return (np.rint(conv).astype(np.int64) & 1).astype(np.uint8)
+
+
+def post_process(alice_key, bob_key, qber, safety_bits=0, rng=None, verbose=True):
+    """
+    Post-processing stage between sifting and encryption:
+    Cascade reconciliation followed by Toeplitz privacy amplification.
+    The final length is n - leaked - n * h(qber) - safety_bits.
+    Parameters:
+    - alice_key, bob_key: uint8 arrays of sifted bits
+    - qber: estimated quantum bit error rate of the channel
+    - safety_bits: extra bits removed as a security margin
+    - rng: numpy Generator for the public permutations and hash seed
+    - verbose: print a one-line summary
+    Returns:
+    - alice_final, bob_final: uint8 arrays of the distilled keys
+    - stats: dict with leaked bits, final length, residual errors and throughput (bits/s)
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    start = time.perf_counter()
+    n = len(alice_key)
+    corrected, leaked = cascade(alice_key, bob_key, qber, rng=rng)
+
+    out_len = max(0, int(n - leaked - np.ceil(n * binary_entropy(qber)) - safety_bits))
+    seed_bits = rng.integers(0, 2, max(n + out_len - 1, 0), dtype=np.uint8)  # public hash seed
+    alice_final, bob_final = toeplitz_hash(np.stack([alice_key, corrected]), out_len, seed_bits)
+    elapsed = time.perf_counter() - start
+
+    stats = {
+        "sifted_bits": n,
+        "leaked_bits": leaked,
+        "final_bits": out_len,
+        "residual_errors": int(np.count_nonzero(alice_key != corrected)),
+        "seconds": elapsed,
+        "throughput": n / elapsed if elapsed > 0 else float('inf'),
+    }
+    if verbose:
+        print(f"Post-processing: {n} -> {out_len} bits, {leaked} parities leaked, "
+              f"{stats['throughput'] / 1e6:.2f} Mbit/s")
+    return alice_final, bob_final, stats
@@ -0,0 +1,198 @@
+import numpy as np
+
+from qnet.belldiagonal import BSM_MODES, BellDiagonal, bell_fidelity
+from qnet.belldiagonal import entanglement_swapping as swap_states
+from qnet.metrics import fidelity
+from qnet.operators import operator
+from qnet.sweep import run_sweep
+
+# Swap orders supported by repeater_chain
+SWAP_ORDERS = ("sequential", "nested")
+
+
+# Define Bell state (|Φ⁺⟩)
+def create_bell_state():
+    # Shared, cached density matrix |Φ⁺⟩⟨Φ⁺| (shape: (4, 4)); treat it as read-only
+    return operator("bell_dm", (2, 2))
+
+
+# Apply noise to a quantum state (Depolarizing channel)
+def apply_depolarizing_noise(state, p):
+    """
+    Depolarizing noise: ρ' = (1-p)ρ + (p/dim)I
+    Parameters:
+    - state: density matrix (shape: (dim, dim))
+    - p: depolarizing noise probability (scalar)
+    Returns:
+    - noisy_state: noisy density matrix (shape: (dim, dim))
+    """
+    dim = np.prod(state.dims[0])  # Total dimension of the system
+    identity = operator("identity", state.dims[0])  # Identity operator with the state's dims, shape: (dim, dim)
+    noisy_state = (1 - p) * state + (p / dim) * identity  # Combine components
+    return noisy_state
+
+
+# Entanglement swapping simulation
+def entanglement_swapping(bell1, bell2):
+    """
+    Perform entanglement swapping between two Bell states:
+    bell1: A-B (shape: (4, 4)), bell2: B-C (shape: (4, 4))
+    Returns:
+    - swapped_state: final entangled state between A and C (shape: (4, 4))
+    """
+    from qutip import tensor
+
+    # Bell measurement on qubits 2 and 3 (middle qubits): cached |00⟩⟨00| + |11⟩⟨11|
+    # tensored with identities on qubits 1 and 4, shape: (16, 16)
+    projection = operator("swap_projection", (2, 2, 2, 2))
+
+    # Combine the two input states into a joint density matrix
+    joint_state = tensor(bell1, bell2)  # Combined state, shape: (16, 16)
+
+    # Apply projection for entanglement swapping
+    swapped_state = (projection * joint_state * projection.dag()).unit()  # Shape: (16, 16)
+
+    # Partial trace over qubits 2 and 3 to get A-C state
+    final_state = swapped_state.ptrace([0, 3])  # Shape: (4, 4)
+    return final_state
+
+
+# Sweep point: fidelity after swapping two links with depolarizing noise p
+def fidelity_point(p, rng):
+    bell1 = create_bell_state()  # Between nodes A and B
+    bell2 = create_bell_state()  # Between nodes B and C
+    bell1_noisy = apply_depolarizing_noise(bell1, p)
+    bell2_noisy = apply_depolarizing_noise(bell2, p)
+    final_state = entanglement_swapping(bell1_noisy, bell2_noisy)
+    # The target is pure, so sqrt(⟨Φ⁺|ρ|Φ⁺⟩) replaces qutip's general matrix square root
+    return float(fidelity(final_state, operator("bell_state", (2, 2))))
+
+
+def plot_fidelity(noise_levels, fidelities, path="Fidelity vs Noise Level in Entanglement Swapping.png"):
+    import matplotlib.pyplot as plt
+
+    plt.plot(noise_levels, fidelities)
+    plt.xlabel("Noise Level (p)")
+    plt.ylabel("Fidelity")
+    plt.title("Fidelity vs. Noise Level in Entanglement Swapping")
+    plt.grid(True)
+    plt.savefig(path)
+
+
+# Network Simulation
+def simulate_network(seed=0, workers=None, plot=True, points=20, batched=False, cache=None):
+    """
+    Simulates a basic quantum repeater network with entanglement swapping.
+    Parameters:
+    - seed: root seed of the noise sweep
+    - workers: number of sweep processes (None = all cores)
+    - plot: save the fidelity vs. noise figure
+    - points: number of noise levels between 0 and 1
+    - batched: evaluate all noise levels as one (points, 4, 4) stack (qnet.batch)
+    - cache: optional qnet.cache.ResultCache for the per-level sweep points
+    Returns:
+    - fidelities: fidelity of the final entangled state with an ideal Bell state, per noise level
+    """
+    noise_levels = np.linspace(0, 1, points)  # Noise levels from 0 to 1
+
+    # Step 1: Calculate fidelity for different noise levels
+    if batched:
+        from qnet.batch import fidelity_curve
+
+        fidelities = cache.call(fidelity_curve, noise_levels) if cache is not None else fidelity_curve(noise_levels)
+        print(f"{points} noise levels: fidelity {fidelities[0]:.6f} (p = 0) to {fidelities[-1]:.6f} (p = 1)")
+    else:
+        # One process-pool task per level
+        fidelities, _ = run_sweep(fidelity_point, noise_levels, seed=seed, workers=workers, cache=cache)
+        for p, fidelity_value in zip(noise_levels, fidelities):
+            print(f"p = {p:.3f}: fidelity = {fidelity_value}")
+
+    # Step 2: Plot fidelity vs noise level
+    if plot:
+        plot_fidelity(noise_levels, fidelities)
+    return fidelities
+
+
+def _distill_links(links, rounds, schedule, protocol):
+    # Distill every link `rounds` times; links must be Bell-diagonal
+    from qnet.distillation import distill_schedule
+
+    if rounds == 0:
+        return links
+    bell_links = [link if isinstance(link, BellDiagonal) else BellDiagonal.from_qobj(link) for link in links]
+    if any(link is None for link in bell_links):
+        raise ValueError("Distillation needs Bell-diagonal link states")
+    coeffs = np.stack([link.coeffs for link in bell_links])
+    distilled = distill_schedule(BellDiagonal(coeffs), rounds, schedule, protocol)[0]
+    return [BellDiagonal(c) for c in distilled.coeffs]
+
+
+def _swap_level(links, bsm="parity"):
+    # One doubling level: swap links (0,1), (2,3), ...; an odd last link waits for the next level
+    if all(isinstance(link, BellDiagonal) for link in links) and len(links) > 1:
+        coeffs = np.stack([link.coeffs for link in links])
+        pairs = len(links) // 2
+        joined = BellDiagonal(coeffs[0:2 * pairs:2]).swap(BellDiagonal(coeffs[1:2 * pairs:2]), bsm)
+        level = [BellDiagonal(c) for c in joined.coeffs]
+    else:
+        level = [swap_states(links[i], links[i + 1], bsm) for i in range(0, len(links) - 1, 2)]
+    if len(links) % 2:
+        level.append(links[-1])
+    return level
+
+
+def repeater_chain(segments, link_noise=0.0, order="sequential", links=None,
+                   distill_rounds=0, level_rounds=0, schedule="recurrence", protocol="dejmps", bsm="parity"):
+    """
+    End-to-end state of an N-segment repeater chain.
+    Neighbouring links are contracted one swap at a time, so only two-qubit
+    states are ever held and the cost is linear in the number of segments.
+    Werner links use the Bell-diagonal closed form; general link states
+    (passed as qutip Qobj in links) go through the full qutip swap.
+    Parameters:
+    - segments: number of elementary links
+    - link_noise: depolarizing probability per link, a scalar or a sequence of
+      length segments (each entry may itself be an array to run a batch of chains)
+    - order: "sequential" (swap left to right) or "nested" (doubling: swap
+      neighbouring pairs level by level)
+    - links: optional list of segments link states replacing the Werner links
+    - distill_rounds: distillation rounds on every elementary link before swapping
+    - level_rounds: distillation rounds after every nesting level (nested order
+      only; needs bsm="full", since the parity swap leaves the Φ⁺ weight at
+      or below 1/2 and distilling its output cannot raise the fidelity)
+    - schedule, protocol: see qnet.distillation.distill_schedule
+    - bsm: "parity" (the projection of entanglement_swapping) or "full"
+      (Bell-state measurement with Pauli-frame correction, Bell-diagonal links only)
+    Returns:
+    - final_state: BellDiagonal (or Qobj) state between the two end nodes
+    - fidelity: fidelity of final_state with |Φ⁺⟩
+    """
+    if order not in SWAP_ORDERS:
+        raise ValueError(f"order must be one of {SWAP_ORDERS}, got {order!r}")
+    if segments < 1:
+        raise ValueError("A repeater chain needs at least one segment")
+    if bsm not in BSM_MODES:
+        raise ValueError(f"bsm must be one of {BSM_MODES}, got {bsm!r}")
+    if level_rounds and bsm == "parity":
+        raise ValueError("level_rounds needs bsm='full': after a parity swap the Φ⁺ weight is at most 1/2")
+    if links is None:
+        noise = np.asarray(link_noise, dtype=np.float64)
+        if noise.ndim == 0:
+            noise = np.full(segments, noise)
+        elif len(noise) != segments:
+            raise ValueError(f"Expected {segments} link noise values, got {len(noise)}")
+        links = [BellDiagonal.werner(p) for p in noise]
+    elif len(links) != segments:
+        raise ValueError(f"Expected {segments} link states, got {len(links)}")
+    links = _distill_links(links, distill_rounds, schedule, protocol)
+
+    if order == "sequential":
+        final_state = links[0]
+        for link in links[1:]:
+            final_state = swap_states(final_state, link, bsm)
+    else:
+        level = list(links)
+        while len(level) > 1:
+            level = _distill_links(_swap_level(level, bsm), level_rounds, schedule, protocol)
+        final_state = level[0]
+    return final_state, bell_fidelity(final_state)
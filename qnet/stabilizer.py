@@ -0,0 +1,466 @@
+"""
+Stabilizer (Clifford) circuit simulation with a bit-packed Aaronson-Gottesman tableau.
+
+Circuits built from H, S, S†, √X, X, Y, Z, CX, CZ, SWAP, measurement, reset
+and classically conditioned Paulis (if_test / c_if) run in polynomial time:
+- one tableau pass (Aaronson & Gottesman, quant-ph/0406196) produces a
+  reference sample, with every random measurement forced to 0;
+- the shots are then sampled as Pauli frames relative to that reference,
+  bit-packed 64 shots per uint64 word. Every qubit starts with a random Z
+  frame and gets a fresh one after each measurement or reset, which turns
+  exactly the random measurements into fair coins.
+
+Tableau rows are packed 64 qubits per word, so row products (the measurement
+step) are word-parallel. run_counts() accepts a qiskit QuantumCircuit, returns
+Aer-style counts, and falls back to Aer for anything outside this gate set.
+"""
+import numpy as np
+
+from qnet.keys import popcount_rows
+
+# Shots per frame-simulation block, bounds the (qubits, block / 64) frame arrays
+SHOT_BLOCK = 1 << 16
+# Single-qubit Cliffords handled in frame mode, and the Paulis allowed under conditions
+GATES_1Q = {"h", "s", "sdg", "sx", "sxdg", "x", "y", "z", "id"}
+GATES_2Q = {"cx", "cz", "swap"}
+PAULIS = {"x", "y", "z", "id"}
+
+
+class NotCliffordError(ValueError):
+    """The circuit uses an operation the stabilizer backend cannot simulate."""
+
+
+def _words(n):
+    return (n + 63) // 64
+
+
+class Tableau:
+    """
+    Stabilizer state of n qubits: rows 0..n-1 destabilizers, n..2n-1 stabilizers.
+    x, z: uint64 arrays of shape (2n, words), r: phase bits of shape (2n,).
+    """
+
+    def __init__(self, n):
+        self.n = n
+        words = _words(n)
+        self.x = np.zeros((2 * n, words), dtype=np.uint64)
+        self.z = np.zeros((2 * n, words), dtype=np.uint64)
+        self.r = np.zeros(2 * n, dtype=bool)
+        rows = np.arange(n)
+        # |0...0⟩: destabilizer i = X_i, stabilizer i = Z_i
+        self.x[rows, rows >> 6] = np.left_shift(np.uint64(1), (rows & 63).astype(np.uint64))
+        self.z[rows + n, rows >> 6] = self.x[rows, rows >> 6]
+
+    def _col(self, arr, q):
+        return ((arr[:, q >> 6] >> np.uint64(q & 63)) & np.uint64(1)).astype(bool)
+
+    def _set_col(self, arr, q, bits):
+        mask = np.uint64(1 << (q & 63))
+        word = arr[:, q >> 6]
+        arr[:, q >> 6] = np.where(bits, word | mask, word & ~mask)
+
+    def h(self, q):
+        xq, zq = self._col(self.x, q), self._col(self.z, q)
+        self.r ^= xq & zq
+        self._set_col(self.x, q, zq)
+        self._set_col(self.z, q, xq)
+
+    def s(self, q):
+        xq, zq = self._col(self.x, q), self._col(self.z, q)
+        self.r ^= xq & zq
+        self._set_col(self.z, q, zq ^ xq)
+
+    def sdg(self, q):
+        for _ in range(3):
+            self.s(q)
+
+    def sx(self, q):
+        self.h(q)
+        self.s(q)
+        self.h(q)
+
+    def sxdg(self, q):
+        self.h(q)
+        self.sdg(q)
+        self.h(q)
+
+    def x_gate(self, q):
+        self.r ^= self._col(self.z, q)
+
+    def z_gate(self, q):
+        self.r ^= self._col(self.x, q)
+
+    def y_gate(self, q):
+        self.r ^= self._col(self.x, q) ^ self._col(self.z, q)
+
+    def cx(self, a, b):
+        xa, za = self._col(self.x, a), self._col(self.z, a)
+        xb, zb = self._col(self.x, b), self._col(self.z, b)
+        self.r ^= xa & zb & ~(xb ^ za)
+        self._set_col(self.x, b, xb ^ xa)
+        self._set_col(self.z, a, za ^ zb)
+
+    def cz(self, a, b):
+        self.h(b)
+        self.cx(a, b)
+        self.h(b)
+
+    def swap(self, a, b):
+        self.cx(a, b)
+        self.cx(b, a)
+        self.cx(a, b)
+
+    @staticmethod
+    def _rowsum(x1, z1, r1, x2, z2, r2):
+        """
+        Products P2 · P1 of Pauli rows (any leading shape), with the phase
+        rule of Aaronson & Gottesman evaluated word-parallel: per qubit the
+        exponent of i is +1, -1 or 0, counted with popcounts.
+        """
+        plus = (x1 & z1 & z2 & ~x2) | (x1 & ~z1 & z2 & x2) | (~x1 & z1 & x2 & ~z2)
+        minus = (x1 & z1 & x2 & ~z2) | (x1 & ~z1 & z2 & ~x2) | (~x1 & z1 & x2 & z2)
+        g = popcount_rows(plus) - popcount_rows(minus)
+        phase = (2 * r1.astype(np.int64) + 2 * r2 + g) % 4
+        return x1 ^ x2, z1 ^ z2, phase == 2
+
+    def measure(self, q, outcome=0):
+        """
+        Z measurement of qubit q. A random outcome is set to `outcome`.
+        Returns:
+        - bit: measured value
+        - random: whether the outcome was random
+        """
+        n = self.n
+        xq = self._col(self.x, q)
+        candidates = np.flatnonzero(xq[n:])
+        if len(candidates):
+            p = n + candidates[0]
+            rows = np.flatnonzero(xq)
+            rows = rows[rows != p]
+            self.x[rows], self.z[rows], self.r[rows] = self._rowsum(
+                self.x[rows], self.z[rows], self.r[rows], self.x[p], self.z[p], self.r[p])
+            self.x[p - n], self.z[p - n], self.r[p - n] = self.x[p], self.z[p], self.r[p]
+            self.x[p] = 0
+            self.z[p] = 0
+            self.z[p, q >> 6] = np.uint64(1 << (q & 63))
+            self.r[p] = bool(outcome)
+            return int(outcome), True
+        # Deterministic: product of the stabilizers paired with destabilizers that
+        # anticommute with Z_q; the stabilizers commute, so reduce as a balanced tree
+        rows = n + np.flatnonzero(xq[:n])
+        x, z, r = self.x[rows], self.z[rows], self.r[rows]
+        while len(r) > 1:
+            half = len(r) // 2
+            px, pz, pr = self._rowsum(x[:half], z[:half], r[:half], x[half:2 * half], z[half:2 * half],
+                                      r[half:2 * half])
+            x = np.concatenate([px, x[2 * half:]])
+            z = np.concatenate([pz, z[2 * half:]])
+            r = np.concatenate([pr, r[2 * half:]])
+        return int(r[0]), False
+
+    def reset(self, q):
+        if self.measure(q)[0]:
+            self.x_gate(q)
+
+
+def _condition(circuit, condition):
+    # (clbit indices, expected bit values) of an (register or clbit, value) condition
+    from qiskit.circuit import Clbit
+
+    target, value = condition
+    if isinstance(target, Clbit):
+        return [circuit.find_bit(target).index], [bool(value)]
+    if hasattr(target, "__len__") and not isinstance(target, str):
+        bits = [circuit.find_bit(bit).index for bit in target]
+        return bits, [bool((value >> i) & 1) for i in range(len(bits))]
+    raise NotCliffordError("Only register or bit conditions are supported")
+
+
+def compile_circuit(circuit):
+    """
+    Flatten a QuantumCircuit into stabilizer operations.
+    Returns:
+    - ops: list of tuples ("h", q) / ("cx", a, b) / ("measure", q, c) / ("reset", q)
+      / ("cond", clbits, values, true_paulis, false_paulis); Paulis are (name, q)
+    Raises NotCliffordError for operations outside the supported set.
+    """
+    ops = []
+
+    def paulis(block, qubit_map):
+        out = []
+        for inst in block.data:
+            name = inst.operation.name
+            if name == "barrier":
+                continue
+            if name not in PAULIS:
+                raise NotCliffordError(f"Conditional {name!r} is not a Pauli")
+            out.append((name, qubit_map[block.find_bit(inst.qubits[0]).index]))
+        return out
+
+    for inst in circuit.data:
+        op = inst.operation
+        name = op.name
+        qubits = [circuit.find_bit(q).index for q in inst.qubits]
+        clbits = [circuit.find_bit(c).index for c in inst.clbits]
+        legacy = getattr(op, "condition", None) if name != "if_else" else None
+        if name == "if_else":
+            bits, values = _condition(circuit, op.condition)
+            true_body = paulis(op.blocks[0], qubits)
+            false_body = paulis(op.blocks[1], qubits) if len(op.blocks) > 1 and op.blocks[1] is not None else []
+            ops.append(("cond", bits, values, true_body, false_body))
+        elif legacy is not None:
+            if name not in PAULIS:
+                raise NotCliffordError(f"Conditional {name!r} is not a Pauli")
+            bits, values = _condition(circuit, legacy)
+            ops.append(("cond", bits, values, [(name, qubits[0])], []))
+        elif name in GATES_1Q:
+            ops.append((name, qubits[0]))
+        elif name in GATES_2Q:
+            ops.append((name, qubits[0], qubits[1]))
+        elif name == "measure":
+            ops.append(("measure", qubits[0], clbits[0]))
+        elif name == "reset":
+            ops.append(("reset", qubits[0]))
+        elif name != "barrier":
+            raise NotCliffordError(f"{name!r} is not supported by the stabilizer backend")
+    return ops
+
+
+def _apply_pauli(tableau, name, q):
+    if name == "x":
+        tableau.x_gate(q)
+    elif name == "y":
+        tableau.y_gate(q)
+    elif name == "z":
+        tableau.z_gate(q)
+
+
+def reference_sample(ops, num_qubits, num_clbits):
+    """
+    One tableau run with random outcomes forced to 0.
+    Returns:
+    - clbits: classical bits at the end (bool array)
+    - record: (measured bit, condition value) per measure / cond op, in order
+    """
+    tableau = Tableau(num_qubits)
+    clbits = np.zeros(num_clbits, dtype=bool)
+    record = []
+    gates = {"h": tableau.h, "s": tableau.s, "sdg": tableau.sdg, "sx": tableau.sx, "sxdg": tableau.sxdg,
+             "x": tableau.x_gate, "y": tableau.y_gate, "z": tableau.z_gate,
+             "cx": tableau.cx, "cz": tableau.cz, "swap": tableau.swap}
+    for op in ops:
+        kind = op[0]
+        if kind == "measure":
+            bit, _ = tableau.measure(op[1])
+            clbits[op[2]] = bit
+            record.append(bit)
+        elif kind == "reset":
+            tableau.reset(op[1])
+        elif kind == "cond":
+            _, bits, values, true_body, false_body = op
+            hit = bool(np.all(clbits[bits] == values))
+            for name, q in (true_body if hit else false_body):
+                _apply_pauli(tableau, name, q)
+            record.append(hit)
+        elif kind != "id":
+            gates[kind](*op[1:])
+    return clbits, record
+
+
+def _sample_block(ops, record, num_qubits, num_clbits, shots, rng):
+    # Pauli-frame sampling of `shots` shots; returns clbits packed as (num_clbits, words)
+    words = _words(shots)
+    fx = np.zeros((num_qubits, words), dtype=np.uint64)
+    fz = rng.integers(0, 1 << 64, size=(num_qubits, words), dtype=np.uint64, endpoint=False)
+    clbits = np.zeros((num_clbits, words), dtype=np.uint64)
+    full = ~np.uint64(0)
+    step = 0
+    for op in ops:
+        kind = op[0]
+        if kind == "h" or kind == "sx" or kind == "sxdg":
+            q = op[1]
+            if kind == "h":
+                fx[q], fz[q] = fz[q].copy(), fx[q].copy()
+            else:
+                fx[q] ^= fz[q]
+        elif kind == "s" or kind == "sdg":
+            fz[op[1]] ^= fx[op[1]]
+        elif kind == "cx":
+            a, b = op[1], op[2]
+            fx[b] ^= fx[a]
+            fz[a] ^= fz[b]
+        elif kind == "cz":
+            a, b = op[1], op[2]
+            fz[a] ^= fx[b]
+            fz[b] ^= fx[a]
+        elif kind == "swap":
+            a, b = op[1], op[2]
+            fx[[a, b]] = fx[[b, a]]
+            fz[[a, b]] = fz[[b, a]]
+        elif kind == "measure":
+            q, c = op[1], op[2]
+            clbits[c] = fx[q] ^ (full if record[step] else np.uint64(0))
+            fz[q] = rng.integers(0, 1 << 64, size=words, dtype=np.uint64, endpoint=False)
+            step += 1
+        elif kind == "reset":
+            fx[op[1]] = 0
+            fz[op[1]] = rng.integers(0, 1 << 64, size=words, dtype=np.uint64, endpoint=False)
+        elif kind == "cond":
+            _, bits, values, true_body, false_body = op
+            hit = np.full(words, full)
+            for bit, value in zip(bits, values):
+                hit &= clbits[bit] if value else ~clbits[bit]
+            # Shots whose branch differs from the reference get the Pauli difference
+            differs = hit ^ (full if record[step] else np.uint64(0))
+            for name, q in true_body + false_body:
+                if name in ("x", "y"):
+                    fx[q] ^= differs
+                if name in ("z", "y"):
+                    fz[q] ^= differs
+            step += 1
+        # Paulis and identities only act on the reference
+    return clbits
+
+
+def sample(circuit, shots=1024, seed=None, block=None):
+    """
+    Sample measurement results of a Clifford circuit.
+    Parameters:
+    - circuit: qiskit QuantumCircuit
+    - shots: number of shots
+    - seed: seed of the frame randomness
+    - block: shots per frame-simulation block (default: sized to the circuit width)
+    Returns:
+    - packed: uint8 array of shape (shots, ceil(num_clbits / 8)), the classical
+      bits of each shot packed with np.packbits (clbit 0 in the top bit of byte 0)
+    Raises NotCliffordError if the circuit is not supported.
+    """
+    ops = compile_circuit(circuit)
+    num_qubits, num_clbits = circuit.num_qubits, circuit.num_clbits
+    _, record = reference_sample(ops, num_qubits, num_clbits)
+    if block is None:
+        # About 2^26 frame and clbit bits per block, in whole words
+        block = max(64, min(SHOT_BLOCK, ((1 << 26) // max(1, num_qubits + num_clbits)) & ~63))
+    rng = np.random.default_rng(seed)
+    results = []
+    for start in range(0, shots, block):
+        count = min(block, shots - start)
+        packed = _sample_block(ops, record, num_qubits, num_clbits, count, rng)
+        bits = np.unpackbits(packed.view(np.uint8), axis=1, count=count, bitorder="little")
+        results.append(np.packbits(bits, axis=0).T)
+    if not results:
+        return np.zeros((0, (num_clbits + 7) // 8), dtype=np.uint8)
+    return np.ascontiguousarray(np.concatenate(results))
+
+
+def _unique_rows(packed):
+    # Distinct shot rows and their counts. Rows are hashed to one uint64 so the
+    # sort runs on integers instead of long byte records; a hash collision is
+    # detected and falls back to the exact (slower) row sort.
+    width = -(-packed.shape[1] // 8) * 8
+    words = np.zeros((len(packed), width), dtype=np.uint8)
+    words[:, :packed.shape[1]] = packed
+    words = words.view(np.uint64)
+    multipliers = np.random.default_rng(0).integers(1, 1 << 63, size=words.shape[1], dtype=np.uint64) | np.uint64(1)
+    hashes = (words * multipliers).sum(axis=1, dtype=np.uint64)
+    _, first, inverse, counts = np.unique(hashes, return_index=True, return_inverse=True, return_counts=True)
+    if not np.array_equal(packed, packed[first][inverse]):
+        return np.unique(packed, axis=0, return_counts=True)
+    return packed[first], counts
+
+
+def _counts(circuit, packed):
+    # Aer-style counts: registers in reverse order, separated by spaces, high bit first
+    unique, counts = _unique_rows(packed)
+    bits = np.unpackbits(unique, axis=1, count=circuit.num_clbits).astype(bool)
+    registers = [[circuit.find_bit(bit).index for bit in reversed(reg)] for reg in reversed(circuit.cregs)]
+    out = {}
+    for row, count in zip(bits, counts.tolist()):
+        out[" ".join("".join("1" if row[i] else "0" for i in reg) for reg in registers)] = count
+    return out
+
+
+def run_counts(circuit, shots=1024, seed=None, fallback=True):
+    """
+    Counts of a circuit on the stabilizer backend, or on Aer when the circuit
+    is not Clifford (fallback=True).
+    Returns:
+    - counts: dict as returned by Aer's get_counts()
+    - backend: "stabilizer" or "aer"
+    """
+    try:
+        packed = sample(circuit, shots, seed)
+    except NotCliffordError:
+        if not fallback:
+            raise
+        from qnet.error_correction import run_circuit
+        return run_circuit(circuit, shots, seed), "aer"
+    return _counts(circuit, packed), "stabilizer"
+
+
+def check_against_aer(shots=4000, seed=0):
+    """
+    Compare the stabilizer backend with Aer on the repo's Clifford circuits
+    and random Clifford circuits (total variation distance of the counts).
+    Raises AssertionError on any mismatch.
+    """
+    from qiskit import ClassicalRegister, QuantumCircuit, QuantumRegister
+
+    from qnet.error_correction import bit_flip_code_circuit, run_circuit
+
+    def swap_circuit():
+        # latex/main.py: entanglement swapping with measured middle qubits
+        qreg = QuantumRegister(4, 'q')
+        c0, c1, c = ClassicalRegister(1, 'c0'), ClassicalRegister(1, 'c1'), ClassicalRegister(2, 'c')
+        qc = QuantumCircuit(qreg, c0, c1, c)
+        qc.h(0)
+        qc.h(2)
+        qc.cx(0, 1)
+        qc.cx(2, 3)
+        qc.cx(1, 2)
+        qc.h(1)
+        qc.measure(2, c1[0])
+        qc.measure(1, c0[0])
+        with qc.if_test((c1, 1)):
+            qc.x(3)
+        with qc.if_test((c0, 1)):
+            qc.z(3)
+        qc.cx(0, 3)
+        qc.h(0)
+        qc.measure(3, c[1])
+        qc.measure(0, c[0])
+        return qc
+
+    def random_clifford(num_qubits, depth, rng):
+        qc = QuantumCircuit(num_qubits, num_qubits)
+        for _ in range(depth):
+            gate = rng.integers(7)
+            a, b = rng.choice(num_qubits, 2, replace=False)
+            [qc.h, qc.s, qc.sdg, qc.sx, qc.x][gate](int(a)) if gate < 5 else \
+                [qc.cx, qc.cz][gate - 5](int(a), int(b))
+        qc.measure(range(num_qubits), range(num_qubits))
+        return qc
+
+    def distance(counts1, counts2):
+        keys = set(counts1) | set(counts2)
+        return 0.5 * sum(abs(counts1.get(k, 0) - counts2.get(k, 0)) for k in keys) / shots
+
+    rng = np.random.default_rng(seed)
+    circuits = [swap_circuit(), bit_flip_code_circuit(), bit_flip_code_circuit(None)]
+    circuits += [random_clifford(5, 40, rng) for _ in range(5)]
+    for qc in circuits:
+        counts, backend = run_counts(qc, shots, seed)
+        assert backend == "stabilizer"
+        assert sum(counts.values()) == shots
+        assert distance(counts, run_circuit(qc, shots, seed)) < 0.05, qc.name
+
+    # Non-Clifford gates fall back to Aer
+    qc = QuantumCircuit(1, 1)
+    qc.t(0)
+    qc.measure(0, 0)
+    assert run_counts(qc, 10, seed)[1] == "aer"
+
+
+if __name__ == "__main__":
+    check_against_aer()
+    print("Stabilizer backend matches Aer")
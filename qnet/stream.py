@@ -0,0 +1,175 @@
+import struct
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from Crypto.Cipher import AES
+
+# Stream header: magic, chunk size, bytes per key
+MAGIC = b"QNS1"
+HEADER = struct.Struct(">4sIQ")
+# Per-chunk record: final flag, ciphertext length (followed by ciphertext and tag)
+RECORD = struct.Struct(">BI")
+TAG_BYTES = 16
+
+CHUNK_SIZE = 1 << 20           # 1 MiB of plaintext per chunk
+ROTATE_BYTES = 64 << 20        # fresh QKD key every 64 MiB
+WORKERS = 4
+
+
+def _nonce(epoch, index):
+    # Unique per key: 4-byte key epoch + 8-byte chunk index
+    return struct.pack(">IQ", epoch, index)
+
+
+def _aad(header, index, final):
+    # Binds each chunk to the stream, its position and whether it is the last one
+    return header + struct.pack(">QB", index, final)
+
+
+def _read_chunks(reader, chunk_size):
+    # Yield (data, final) with one chunk of lookahead so the last chunk is known
+    data = reader.read(chunk_size)
+    while True:
+        following = reader.read(chunk_size) if len(data) == chunk_size else b""
+        final = not following
+        yield data, final
+        if final:
+            return
+        data = following
+
+
+def _ordered(pool, tasks, window):
+    # Submit tasks to the pool while keeping at most `window` in flight, yield results in order
+    pending = deque()
+    for func, args in tasks:
+        pending.append(pool.submit(func, *args))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+class _KeySchedule:
+    # Draws a fresh key from key_source whenever the chunk index enters a new epoch
+    def __init__(self, key_source, chunks_per_key):
+        self.key_source = key_source
+        self.chunks_per_key = chunks_per_key
+        self.epoch = -1
+        self.key = None
+        self.rotations = 0
+
+    def key_for(self, index):
+        epoch = index // self.chunks_per_key
+        if epoch != self.epoch:
+            self.key = bytes(self.key_source())
+            self.epoch = epoch
+            self.rotations += 1
+        return epoch, self.key
+
+
+def _encrypt_chunk(key, epoch, index, header, data, final):
+    cipher = AES.new(key, AES.MODE_GCM, nonce=_nonce(epoch, index))
+    cipher.update(_aad(header, index, final))
+    ciphertext, tag = cipher.encrypt_and_digest(data)
+    return RECORD.pack(final, len(ciphertext)) + ciphertext + tag, len(data)
+
+
+def _decrypt_chunk(key, epoch, index, header, ciphertext, tag, final):
+    cipher = AES.new(key, AES.MODE_GCM, nonce=_nonce(epoch, index))
+    cipher.update(_aad(header, index, final))
+    return cipher.decrypt_and_verify(ciphertext, tag)  # ValueError if tampered
+
+
+def _report(label, nbytes, elapsed, rotations):
+    rate = nbytes / elapsed / 1e6 if elapsed > 0 else float('inf')
+    print(f"{label}: {nbytes / 1e6:.1f} MB in {elapsed:.2f} s ({rate:.1f} MB/s, {rotations} key(s))")
+    return {"bytes": nbytes, "seconds": elapsed, "mb_per_s": rate, "keys_used": rotations}
+
+
+def encrypt_stream(reader, writer, key_source, chunk_size=CHUNK_SIZE,
+                   rotate_bytes=ROTATE_BYTES, workers=WORKERS):
+    """
+    Chunked AES-GCM encryption of a binary stream with QKD key rotation.
+    The input is read through buffered I/O one chunk at a time and chunks
+    are sealed on a thread pool. Every chunk gets its own nonce and is
+    authenticated together with its index and a final-chunk flag, so
+    reordering and truncation are detected on decryption.
+    Parameters:
+    - reader, writer: binary file objects
+    - key_source: callable returning 16 or 32 bytes of fresh key material,
+      e.g. lambda: pool.get_key(256); called once per rotation, in order
+    - chunk_size: plaintext bytes per chunk
+    - rotate_bytes: plaintext bytes encrypted under one key (rounded to whole chunks)
+    - workers: encryption threads
+    Returns:
+    - stats: dict with bytes, seconds, MB/s and number of keys used
+    """
+    header = HEADER.pack(MAGIC, chunk_size, rotate_bytes)
+    schedule = _KeySchedule(key_source, max(1, rotate_bytes // chunk_size))
+    writer.write(header)
+
+    def tasks():
+        for index, (data, final) in enumerate(_read_chunks(reader, chunk_size)):
+            epoch, key = schedule.key_for(index)
+            yield _encrypt_chunk, (key, epoch, index, header, data, final)
+
+    start = time.perf_counter()
+    total = 0
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for record, nbytes in _ordered(pool, tasks(), 2 * workers):
+            writer.write(record)
+            total += nbytes
+    return _report("Encrypted", total, time.perf_counter() - start, schedule.rotations)
+
+
+def decrypt_stream(reader, writer, key_source, workers=WORKERS):
+    """
+    Decrypt and verify a stream written by encrypt_stream.
+    key_source must return the same key sequence that was used to encrypt.
+    Raises ValueError if the stream is malformed, tampered with or truncated.
+    Returns:
+    - stats: dict with bytes, seconds, MB/s and number of keys used
+    """
+    header = reader.read(HEADER.size)
+    if len(header) != HEADER.size or header[:4] != MAGIC:
+        raise ValueError("Not an encrypted QKD stream")
+    _, chunk_size, rotate_bytes = HEADER.unpack(header)
+    schedule = _KeySchedule(key_source, max(1, rotate_bytes // chunk_size))
+
+    def tasks():
+        index = 0
+        while True:
+            record = reader.read(RECORD.size)
+            if len(record) != RECORD.size:
+                raise ValueError("Encrypted stream is truncated")
+            final, length = RECORD.unpack(record)
+            ciphertext = reader.read(length)
+            tag = reader.read(TAG_BYTES)
+            if len(ciphertext) != length or len(tag) != TAG_BYTES:
+                raise ValueError("Encrypted stream is truncated")
+            epoch, key = schedule.key_for(index)
+            yield _decrypt_chunk, (key, epoch, index, header, ciphertext, tag, final)
+            if final:
+                return
+            index += 1
+
+    start = time.perf_counter()
+    total = 0
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for data in _ordered(pool, tasks(), 2 * workers):
+            writer.write(data)
+            total += len(data)
+    if reader.read(1):
+        raise ValueError("Unexpected data after the final chunk")
+    return _report("Decrypted", total, time.perf_counter() - start, schedule.rotations)
+
+
+def encrypt_file(src_path, dst_path, key_source, **kwargs):
+    with open(src_path, "rb") as reader, open(dst_path, "wb") as writer:
+        return encrypt_stream(reader, writer, key_source, **kwargs)
+
+
+def decrypt_file(src_path, dst_path, key_source, **kwargs):
+    with open(src_path, "rb") as reader, open(dst_path, "wb") as writer:
+        return decrypt_stream(reader, writer, key_source, **kwargs)
@@ -0,0 +1,170 @@
+"""
+Monte Carlo estimate of the end-to-end delivery time of a repeater chain.
+
+Each trial draws geometric link-generation attempt counts for every
+segment, combines them under a swap protocol and returns the time at which
+both end nodes hold a heralded end-to-end pair. Trials are independent rows
+of NumPy arrays, processed in blocks and spread over a process pool by
+qnet.sweep.run_sweep, which gives every block its own seed.
+- swap_asap: memories hold their pairs and every node swaps as soon as both
+  of its links exist (deterministic swaps); the ends know the result once
+  the last swap outcome has reached them.
+- doubling: nested swapping of 2^levels segments; a level-l swap joins two
+  independently generated level-(l-1) links and succeeds with probability
+  swap_success, otherwise both halves are regenerated.
+"""
+import time
+
+import numpy as np
+
+from qnet.sweep import run_sweep
+
+# Speed of light in optical fibre (m/s)
+C_FIBER = 2e8
+PROTOCOLS = ("swap_asap", "doubling")
+# Trials per block: bounds the (block, segments) arrays to a few tens of MiB
+BLOCK = 1 << 19
+PERCENTILES = (50, 90, 99)
+
+
+def _link_times(count, link_success, attempt_time, rng):
+    # Heralded generation time of `count` independent links. Attempts are
+    # geometric, drawn by inverse CDF (about twice as fast as rng.geometric):
+    # K = floor(log(U) / log(1 - p)) + 1 with U uniform on (0, 1]
+    times = 1.0 - rng.random(count)
+    np.log(times, out=times)
+    times *= 1 / np.log1p(-link_success)
+    np.floor(times, out=times)
+    times += 1
+    times *= attempt_time
+    return times
+
+
+def _swap_asap(trials, segments, link_success, attempt_time, hop_delay, rng):
+    links = _link_times(trials * segments, link_success, attempt_time, rng).reshape(trials, segments)
+    if segments == 1:
+        return links[:, 0]
+    # Node k (1..segments-1) swaps once links k-1 and k exist; the outcome
+    # travels max(k, segments - k) hops to the farther end node
+    nodes = np.arange(1, segments)
+    delay = np.maximum(nodes, segments - nodes) * hop_delay
+    swap_times = np.maximum(links[:, :-1], links[:, 1:]) + delay
+    return swap_times.max(axis=1)
+
+
+def _doubling(trials, level, link_success, attempt_time, hop_delay, swap_success, rng):
+    if level == 0:
+        return _link_times(trials, link_success, attempt_time, rng)
+    # Swap tries per trial, each on two fresh level-1 links; the outcome
+    # reaches the ends 2^(level-1) hops away before the next step
+    tries = rng.geometric(swap_success, trials) if swap_success < 1 else np.ones(trials, dtype=np.int64)
+    total = int(tries.sum())
+    halves = _doubling(2 * total, level - 1, link_success, attempt_time, hop_delay, swap_success, rng)
+    per_try = np.maximum(halves[0::2], halves[1::2]) + (1 << (level - 1)) * hop_delay
+    trial_of_try = np.repeat(np.arange(trials), tries)
+    return np.bincount(trial_of_try, weights=per_try, minlength=trials)
+
+
+def delivery_times(trials, segments, protocol="swap_asap", link_success=0.1, segment_length=10e3,
+                   attempt_time=None, swap_success=1.0, rng=None):
+    """
+    End-to-end delivery time of `trials` independent runs, in seconds.
+    Parameters:
+    - trials: number of Monte Carlo trials
+    - segments: number of elementary links (a power of two for doubling)
+    - protocol: "swap_asap" or "doubling"
+    - link_success: success probability of one generation attempt
+    - segment_length: segment length in metres
+    - attempt_time: seconds per attempt (default: one segment round trip)
+    - swap_success: swap success probability (doubling only; swap_asap needs 1)
+    - rng: numpy Generator
+    Returns:
+    - times: array of shape (trials,)
+    """
+    if protocol not in PROTOCOLS:
+        raise ValueError(f"protocol must be one of {PROTOCOLS}, got {protocol!r}")
+    rng = np.random.default_rng() if rng is None else rng
+    hop_delay = segment_length / C_FIBER
+    attempt_time = 2 * hop_delay if attempt_time is None else attempt_time
+    if protocol == "swap_asap":
+        if swap_success != 1.0:
+            raise ValueError("swap_asap assumes deterministic swaps; use doubling or qnet.eventsim")
+        return _swap_asap(trials, segments, link_success, attempt_time, hop_delay, rng)
+    levels = segments.bit_length() - 1
+    if segments != 1 << levels:
+        raise ValueError(f"doubling needs a power-of-two number of segments, got {segments}")
+    return _doubling(trials, levels, link_success, attempt_time, hop_delay, swap_success, rng)
+
+
+def _block_point(point, rng):
+    # Sweep point: (trials, keyword arguments of delivery_times)
+    trials, kwargs = point
+    return delivery_times(trials, rng=rng, **kwargs)
+
+
+def estimate_waiting_time(trials=10_000_000, segments=8, protocol="swap_asap", link_success=0.1,
+                          segment_length=10e3, attempt_time=None, swap_success=1.0,
+                          seed=0, workers=None, block=BLOCK, verbose=True):
+    """
+    Distribution of the end-to-end delivery time over many trials.
+    Parameters: as delivery_times, plus
+    - seed: root seed; each block of trials gets its own child seed
+    - workers: process count (None = all cores, 1 = in this process)
+    - block: trials per task
+    Returns:
+    - stats: dict with trials, mean, std, percentiles (seconds), rate
+      (delivered pairs per second, 1 / mean) and trials_per_s
+    """
+    kwargs = dict(segments=segments, protocol=protocol, link_success=link_success,
+                  segment_length=segment_length, attempt_time=attempt_time, swap_success=swap_success)
+    sizes = [min(block, trials - start) for start in range(0, trials, block)]
+    start = time.perf_counter()
+    blocks, _ = run_sweep(_block_point, [(size, kwargs) for size in sizes], seed=seed, workers=workers)
+    times = np.concatenate(blocks)
+    elapsed = time.perf_counter() - start
+
+    mean = times.mean()
+    stats = {
+        "trials": trials,
+        "mean": mean,
+        "std": times.std(),
+        "percentiles": dict(zip(PERCENTILES, np.percentile(times, PERCENTILES))),
+        "rate": 1 / mean,
+        "trials_per_s": trials / elapsed if elapsed > 0 else float('inf'),
+    }
+    if verbose:
+        quantiles = ", ".join(f"p{q} {value * 1e3:.3f} ms" for q, value in stats["percentiles"].items())
+        print(f"{protocol}, {segments} segments, {trials} trials: mean {mean * 1e3:.3f} ms ({quantiles}), "
+              f"rate {stats['rate']:.2f} pairs/s, {stats['trials_per_s']:.3g} trials/s")
+    return stats
+
+
+def check_waiting_time(trials=200_000, seed=0):
+    """
+    Compare the Monte Carlo means with closed forms.
+    Raises AssertionError on any mismatch.
+    """
+    rng = np.random.default_rng(seed)
+    p, hop = 0.1, 10e3 / C_FIBER
+    # One segment: mean of a geometric number of attempts, 1/p round trips
+    times = delivery_times(trials, 1, link_success=p, rng=rng)
+    assert np.isclose(times.mean(), 2 * hop / p, rtol=0.02)
+    # Two segments, deterministic swap: E[max of two geometrics] + one hop
+    q = 1 - p
+    expected_max = (2 / p - 1 / (1 - q * q)) * 2 * hop
+    for protocol in PROTOCOLS:
+        times = delivery_times(trials, 2, protocol, link_success=p, rng=rng)
+        assert np.isclose(times.mean(), expected_max + hop, rtol=0.02), protocol
+    # Doubling with probabilistic swaps: E[T1] = E[tries] * E[per try]
+    times = delivery_times(trials, 2, "doubling", link_success=p, swap_success=0.5, rng=rng)
+    assert np.isclose(times.mean(), 2 * (expected_max + hop), rtol=0.02)
+    # Four segments, swap_asap: the mean lies between E[max of four geometrics]
+    # plus the nearest (2 hops) and the farthest (3 hops) swap message delay
+    expected_max = sum(1 - (1 - q ** k) ** 4 for k in range(2000)) * 2 * hop
+    times = delivery_times(trials, 4, link_success=p, rng=rng)
+    assert expected_max + 2 * hop < times.mean() < expected_max + 3 * hop
+
+
+if __name__ == "__main__":
+    check_waiting_time()
+    print("Monte Carlo waiting times match the closed forms")
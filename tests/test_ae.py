@@ -0,0 +1,15 @@
+import pytest
+
+from qnet import ae
+
+
+def test_dense_backend_rejects_large_networks():
+    # 9 nodes are 16 qubits: the qutip path would need a 64 GiB density matrix
+    with pytest.raises(ValueError, match="--backend mps"):
+        ae.simulate_routing(num_nodes=9)
+
+
+def test_mps_backend_handles_large_networks():
+    success_prob, _ = ae.simulate_routing(num_nodes=9, noise_prob=0.0, backend="mps")
+    # The last node holds half of a Bell pair: rho = I/2, so |rho[0, 0]|^2 = 1/4
+    assert success_prob == pytest.approx(0.25)
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from qnet import bb84
+
+
+def _original_exchange(num_qubits, seed):
+    # The baseline demo loop: generate_bb84_states, Bob's bases, measure_state
+    np.random.seed(seed)
+    states, alice_bases = bb84.generate_bb84_states(num_qubits)
+    bob_bases = np.random.choice(['z', 'x'], num_qubits)
+    bob_results = [bb84.measure_state(state, bob_bases[i]) for i, state in enumerate(states)]
+    return states, alice_bases, bob_bases, bob_results
+
+
+def _as_arrays(states, alice_bases, bob_bases):
+    # Map the qutip choices onto the array engine's uint8 labels
+    zero, one, plus, minus = bb84._qutip_states()
+    bits = np.array([int(state is one or state is minus) for state in states], dtype=np.uint8)
+    labels = {'z': bb84.Z, 'x': bb84.X}
+    return (bits,
+            np.array([labels[b] for b in alice_bases], dtype=np.uint8),
+            np.array([labels[b] for b in bob_bases], dtype=np.uint8))
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_array_engine_matches_original_path(seed):
+    num_qubits = 2000
+    states, alice_bases, bob_bases, bob_results = _original_exchange(num_qubits, seed)
+    matching = [alice_bases[i] == bob_bases[i] for i in range(num_qubits)]
+    original_key = [int(bob_results[i]) for i in range(num_qubits) if matching[i]]
+
+    bits, a_bases, b_bases = _as_arrays(states, alice_bases, bob_bases)
+    results = bb84.measure_arrays(bits, a_bases, b_bases, np.random.default_rng(seed))
+    key, rate = bb84.sift(a_bases, b_bases, results)
+
+    # Matching bases are deterministic: the keys agree bit for bit
+    assert key.tolist() == original_key
+    assert rate == len(original_key) / num_qubits
+    # Mismatched bases are fair coins on both paths (5 sigma)
+    mismatched = a_bases != b_bases
+    tolerance = 5 * 0.5 / np.sqrt(mismatched.sum())
+    assert abs(np.mean(np.array(bob_results)[mismatched]) - 0.5) < tolerance
+    assert abs(np.mean(results[mismatched]) - 0.5) < tolerance
+
+
+def test_born_table_and_qutip_reference():
+    assert bb84.check_parity(num_qubits=500, seed=3) == pytest.approx(0.5, abs=0.1)
+
+
+def test_packed_sifting_matches_uint8():
+    alice, bob = bb84.sifted_key_pair(10_001, 0.05, np.random.default_rng(4))
+    packed_alice, packed_bob = bb84.sifted_key_pair(10_001, 0.05, np.random.default_rng(4), packed=True)
+    assert np.array_equal(packed_alice.bits(), alice)
+    assert np.array_equal(packed_bob.bits(), bob)
+    assert packed_alice.error_count(packed_bob) == np.count_nonzero(alice != bob)
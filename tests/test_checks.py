@@ -0,0 +1,34 @@
+"""
+Run every module's check_*() reference comparison under pytest (the same
+functions `python -m qnet.<module>` runs).
+"""
+import importlib
+
+import pytest
+
+CHECKS = [
+    ("batch", "check_against_qutip"),
+    ("belldiagonal", "check_against_qutip"),
+    ("cache", "check_cache"),
+    ("channels", "check_against_qutip"),
+    ("distillation", "check_against_circuit"),
+    ("e91", "check_e91"),
+    ("eventsim", "check_against_belldiagonal"),
+    ("marginals", "check_against_qutip"),
+    ("metrics", "check_against_qutip"),
+    ("mps", "check_against_qutip"),
+    ("operators", "check_cache"),
+    ("stabilizer", "check_against_aer"),
+    ("topology", "check_routing"),
+    ("waiting", "check_waiting_time"),
+]
+
+# Checks whose reference implementation is an optional dependency
+REQUIRES = {"stabilizer": "qiskit_aer"}
+
+
+@pytest.mark.parametrize("module, name", CHECKS, ids=[f"{m}.{n}" for m, n in CHECKS])
+def test_check(module, name):
+    if module in REQUIRES:
+        pytest.importorskip(REQUIRES[module])
+    getattr(importlib.import_module(f"qnet.{module}"), name)()
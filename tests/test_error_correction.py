@@ -0,0 +1,19 @@
+import pytest
+
+from qnet.cache import ResultCache
+
+pytest.importorskip("qiskit_aer")
+
+from qnet.error_correction import bit_flip_code_circuit, run_circuit  # noqa: E402
+
+
+def test_cache_only_stores_seeded_runs(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    qc = bit_flip_code_circuit(1)
+    run_circuit(qc, shots=64, cache=cache)
+    run_circuit(qc, shots=64, cache=cache)
+    assert cache.stats()["entries"] == 0 and cache.hits == 0
+
+    first = run_circuit(qc, shots=64, seed=5, cache=cache)
+    assert run_circuit(qc, shots=64, seed=5, cache=cache) == first
+    assert cache.stats()["entries"] == 1 and cache.hits == 1
@@ -0,0 +1,25 @@
+import pytest
+
+from qnet.keypool import KeyPool
+
+
+def test_serves_aes_keys():
+    with KeyPool(capacity_bits=1 << 12, round_qubits=2048, error_rate=0.02, seed=0) as pool:
+        assert len(pool.get_key(128, timeout=30)) == 16
+        assert len(pool.get_key(256, timeout=30)) == 32
+        stats = pool.stats()
+    assert stats["refills"] >= 1 and 0 <= stats["last_qber"] < 0.1
+
+
+def test_failing_round_reaches_waiters(monkeypatch):
+    def failing_round(self):
+        raise ValueError("round failed")
+
+    monkeypatch.setattr(KeyPool, "_round", failing_round)
+    pool = KeyPool(seed=0)
+    # The waiter is woken with the refill error instead of blocking forever
+    with pytest.raises(ValueError, match="round failed"):
+        pool.get_key(128, timeout=None)
+    with pytest.raises(ValueError, match="round failed"):
+        pool.close()
+    assert not pool._thread.is_alive()